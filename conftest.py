@@ -0,0 +1 @@
+# Puts the project root on sys.path under plain `pytest` too, so tests import `tools.*`.
@@ -0,0 +1,42 @@
+import functools
+
+import numpy as np
+import yaml
+from PIL import Image
+
+from tools import copy_paste_bank as C
+from tools.yolo_dataset import YoloDataset, read_labels
+
+BOXES = [(0, 0.25, 0.25, 0.30, 0.30), (1, 0.75, 0.30, 0.30, 0.20), (2, 0.50, 0.75, 0.60, 0.30)]
+
+def _screens(root, n=4):
+    # 3-box screens; class 2 (the big one) is banked and pasted back
+    for d in ("train/images", "train/labels"): (root/d).mkdir(parents=True)
+    for i in range(n):
+        Image.new("RGB", (200, 400), (30*i, 90, 160)).save(root/f"train/images/s{i}.png")
+        (root/f"train/labels/s{i}.txt").write_text("\n".join(" ".join(map(str, b)) for b in BOXES))
+    (root/"data.yaml").write_text("names: [a, b, c]\nnc: 3\ntrain: train/images\n")
+    return root/"data.yaml"
+
+def _xyxy(lab):
+    return np.stack([lab[:,1]-lab[:,3]/2, lab[:,2]-lab[:,4]/2, lab[:,1]+lab[:,3]/2, lab[:,2]+lab[:,4]/2], 1)
+
+def test_render_keeps_original_labels_and_respects_max_cover(tmp_path, monkeypatch):
+    monkeypatch.setattr(C, "YoloDataset", functools.partial(YoloDataset, cache_dir=None))
+    data = _screens(tmp_path/"ds")
+    C.build_bank(data, tmp_path/"bank", classes=[2], workers=1)
+    out = tmp_path/"cp"
+    C.render(tmp_path/"bank", out, composites=12, pastes=3, workers=1)
+    pasted = 0
+    for lbl in sorted((out/"labels").glob("*.txt")):
+        lab = read_labels(lbl)
+        assert np.allclose(lab[:3], BOXES, atol=1e-6)   # every original label, unchanged
+        pasted += len(lab) - 3
+        # each box is hidden by at most max_cover of the pastes on top of it
+        xyxy = _xyxy(lab)
+        for i in range(len(lab)):
+            later = [tuple(b) for b in xyxy[max(i+1, 3):]]
+            assert C._covered(xyxy[i:i+1], later)[0] <= 0.3 + 1e-6
+    assert len(list((out/"images").glob("*.jpg"))) == 12
+    assert 0 < pasted < 12*3   # some pastes fit, the big crop can't always find room
+    assert yaml.safe_load((out/"data.yaml").read_text())["train"][1] == str(out/"images")
@@ -0,0 +1,38 @@
+import importlib, os, subprocess, sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULES = sorted(p.stem for p in (ROOT/"tools").glob("*.py") if not p.stem.startswith("__"))
+
+def test_modules_import_as_package_without_side_effects(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in MODULES:
+        importlib.import_module(f"tools.{name}")
+    assert list(tmp_path.iterdir()) == []   # no data_yolo/, data_raw/, caches at import
+
+def test_heavy_modules_load_on_use_not_on_import():
+    code = ("import sys\n" + "".join(f"import tools.{m}\n" for m in MODULES) +
+            "print(sorted({m.split('.')[0] for m in sys.modules} & {'numpy', 'PIL', 'yaml', 'datasets', 'tqdm'}))")
+    assert _ok("-c", code).strip() == "[]"
+
+def _ok(*cmd, cwd=ROOT):
+    r = subprocess.run([sys.executable, *cmd], cwd=cwd, capture_output=True, text=True,
+                       env={**os.environ, "PYTHONPATH": ""})
+    assert r.returncode == 0, r.stderr
+    return r.stdout
+
+def test_cli_runs_as_directory_and_as_module():
+    assert "convert" in _ok("tools", "--help")
+    assert "convert" in _ok("-m", "tools", "--help")
+    assert "--fraction" in _ok("-m", "tools", "pack", "subset", "--help")
+
+def test_pack_help_is_for_the_step_the_target_runs():
+    out = _ok("tools", "pack", "rico-cache", "--help")
+    assert out.startswith("usage: tools pack rico-cache [-h] [--cache CACHE]") and "{build,relabel}" not in out
+    out = _ok("tools", "pack", "cp-render", "--help")
+    assert "--max-cover" in out and "--rarest" not in out
+
+def test_scripts_still_run_directly():
+    assert "--rarest" in _ok("tools/copy_paste_bank.py", "bank", "--help")
+    assert "{build,relabel}" in _ok("tools/rico_cache.py", "--help")
+    assert "--fraction" in _ok("tools/select_subset.py", "--help")
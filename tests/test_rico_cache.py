@@ -0,0 +1,35 @@
+import random
+
+from tools import bench, rico_cache, rico_to_yolo as R
+
+def _files(root):
+    return {p.relative_to(root).as_posix(): p.read_bytes() for p in root.rglob("*") if p.is_file()}
+
+def test_relabel_matches_rico_to_yolo(tmp_path, monkeypatch):
+    rng = random.Random(0)
+    img, js = tmp_path/"screens", tmp_path/"view_hierarchies"
+    img.mkdir(); js.mkdir()
+    shapes = list(bench.RICO_SHAPES.values()) + [bench.rico_xml]   # + raw XML, not wrapped in JSON
+    for i in range(24):
+        base = f"rico_{('train', 'validation', 'test')[i % 3]}_{i:04d}"
+        bench.write_png(img/f"{base}.png", 360, 640)
+        (js/f"{base}.json").write_text(shapes[i % len(shapes)](40, rng), encoding="utf-8")
+    (js/"rico_train_0000.json").write_text("not json, not xml", encoding="utf-8")
+    monkeypatch.setattr(R, "RICO_IMG", img)
+    monkeypatch.setattr(R, "RICO_JSON", js)
+
+    monkeypatch.setattr(R, "OUT", tmp_path/"direct")
+    R.main()
+    cache = tmp_path/"nodes.npz"
+    rico_cache.build(cache)
+    rico_cache.relabel(cache, tmp_path/"cached")
+
+    direct = _files(tmp_path/"direct")
+    assert len(direct) > 20
+    assert _files(tmp_path/"cached") == direct
+
+def test_strings_round_trip(tmp_path):
+    strs = ["", "android.widget.Button", "Ünïcode ✓", "x" * 300]
+    z = rico_cache._pack_strings(strs, "v")
+    assert rico_cache._unpack_strings(z, "v") == strs
+    assert rico_cache._unpack_strings(rico_cache._pack_strings([], "v"), "v") == []
@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+from tools import uiv_any_to_yolo as A
+
+IMAGES = {f"s{i}.png": Path(f"/imgs/s{i}.png") for i in range(4)}
+
+def _rec(image, *objs):
+    return {"image": image, "objects": [{"label": l, "bbox": b} for l, b in objs]}
+
+def test_merges_across_files_and_drops_repeats():
+    index = {}
+    assert A.merge_records([_rec("S0.png", ("button", [0, 0, 5, 5])), _rec("gone.png", ("text", [1, 1, 2, 2]))],
+                           IMAGES, index)
+    assert A.merge_records([_rec("s0.png", ("button", [0, 0, 5, 5]), ("button", [0, 0, 6, 6]), ("text", [0, 0, 5, 5])),
+                            _rec("s1.png", ("icon", [1, 2, 3, 4]))], IMAGES, index)
+    assert sorted(index) == ["s0.png", "s1.png"]   # gone.png has no image on disk
+    assert index["s0.png"]["image"] == IMAGES["s0.png"]
+    assert [(o["label"], o["bbox"]) for o in index["s0.png"]["objects"]] == [
+        ("button", [0, 0, 5, 5]), ("button", [0, 0, 6, 6]), ("text", [0, 0, 5, 5])]
+
+def test_unhashable_object_is_skipped_alone():
+    index = {}
+    assert A.merge_records([_rec("s0.png", (["button"], [0, 0, 5, 5]), ("text", [0, [1], 5, 5]),
+                                 ("text", [0, 0, 5, 5]))], IMAGES, index)
+    assert [o["label"] for o in index["s0.png"]["objects"]] == ["text"]
+
+def test_limit_caps_images_not_objects():
+    index = {}
+    assert A.merge_records([_rec("s0.png", ("a", [0, 0, 1, 1])), _rec("s1.png", ("a", [0, 0, 1, 1]))], IMAGES, index, 2)
+    # already-indexed images still collect objects; a third image stops the pass
+    assert not A.merge_records([_rec("s1.png", ("b", [0, 0, 1, 1])), _rec("s2.png", ("a", [0, 0, 1, 1])),
+                                _rec("s0.png", ("c", [0, 0, 1, 1]))], IMAGES, index, 2)
+    assert sorted(index) == ["s0.png", "s1.png"]
+    assert len(index["s1.png"]["objects"]) == 2 and len(index["s0.png"]["objects"]) == 1
+
+def _convert(tmp_path, monkeypatch, files, **kw):
+    from PIL import Image
+    monkeypatch.chdir(tmp_path)
+    (tmp_path/"images").mkdir()
+    for i in range(4): Image.new("RGB", (100, 100)).save(tmp_path/f"images/s{i}.png")
+    paths = []
+    for name, obj in files.items():
+        p = tmp_path/name
+        p.write_text("\n".join(json.dumps(o) for o in obj) if name.endswith(".jsonl") else json.dumps(obj))
+        paths.append(p)
+    monkeypatch.setattr(A, "ANN_FILES", paths)
+    monkeypatch.setattr(A, "IMG_ROOT", tmp_path/"images")
+    monkeypatch.setattr(A, "YOLO", tmp_path/"out")
+    A.main(**kw)
+    return {p.name: p.read_text().splitlines() for p in (tmp_path/"out/labels").rglob("*.txt")}
+
+def test_main_merges_files_and_keeps_files_with_bad_objects(tmp_path, monkeypatch):
+    labels = _convert(tmp_path, monkeypatch, {
+        "a.json": {"records": [_rec("s0.png", ("button", [10, 10, 20, 20])),
+                               _rec("s1.png", (["odd"], [0, 0, 9, 9]), ("text", [30, 30, 50, 40]))]},
+        "b.jsonl": [_rec("s0.png", ("button", [10, 10, 20, 20]), ("heading", [0, 0, 50, 10]))],
+    })
+    assert sorted(labels) == ["s0.txt", "s1.txt"]
+    assert [l.split()[0] for l in labels["s0.txt"]] == ["0", "2"]   # button once, + heading from b.jsonl
+    assert len(labels["s1.txt"]) == 1
+
+def test_main_max_files_caps_images(tmp_path, monkeypatch):
+    labels = _convert(tmp_path, monkeypatch, {
+        "a.json": [_rec(f"s{i}.png", ("button", [10, 10, 20, 20])) for i in range(3)],
+        "b.json": [_rec("s3.png", ("button", [10, 10, 20, 20])), _rec("s0.png", ("text", [30, 30, 50, 40]))],
+    }, max_files=2)
+    assert sorted(labels) == ["s0.txt", "s1.txt"]
+    assert labels["s0.txt"] == ["0 0.150000 0.150000 0.100000 0.100000"]
@@ -0,0 +1,58 @@
+import json
+import random
+
+import pytest
+
+from tools import uiv_schema as S
+from tools.uiv_any_to_yolo import parse_bbox, to_records
+
+FORMS = {
+    "bbox":   lambda l, b: {"category": l, "bbox": [b[0], b[1], b[2]-b[0], b[3]-b[1]]},
+    "xywh":   lambda l, b: {"class": l, "x": b[0], "y": b[1], "width": b[2]-b[0], "height": b[3]-b[1]},
+    "x1y2":   lambda l, b: {"name": l, "x1": b[0], "y1": b[1], "x2": b[2], "y2": b[3]},
+    "coords": lambda l, b: {"type": l, "coords": list(b)},
+}
+
+def _box(rng):
+    x, y = rng.randrange(500), rng.randrange(500)
+    return (x, y, x + rng.randrange(1, 90), y + rng.randrange(1, 90))
+
+def _deviate(rng, rec, objs_key):
+    """Make one record stray from the file's plan in a way the generic probing treats differently."""
+    kind = rng.randrange(5)
+    o = rec[objs_key][0]
+    if kind == 0: o["label"] = "earlier label key"
+    elif kind == 1: o.update(bbox=[1, 2, 3, 4])          # bbox wins over x/y, x1.., coords
+    elif kind == 2: o.update(x=5, y=6, w=7, h=8)         # x/y + w/h win over width/height, x1.., coords
+    elif kind == 3: rec["meta"] = {"image": f"meta/{rec.pop('image_name')}"}
+    else: rec["objects" if objs_key != "objects" else "elements"] = [FORMS["bbox"]("button", (0, 0, 9, 9))]
+
+@pytest.mark.parametrize("form", sorted(FORMS))
+@pytest.mark.parametrize("objs_key", ["bboxes", "objects"])
+def test_planned_matches_generic_with_deviating_records(form, objs_key):
+    rng = random.Random(form + objs_key)
+    recs = [{"image_name": f"imgs/s{i}.png", objs_key: [FORMS[form](rng.choice(["button", "text"]), _box(rng))
+                                                       for _ in range(4)]} for i in range(300)]
+    plan = S.infer_plan(S.iter_leaves(recs[:S.SAMPLE]))
+    assert plan and plan["image"] == "image_name" and plan["objects"] == objs_key
+    for rec in recs[S.SAMPLE::3]:
+        _deviate(rng, rec, objs_key)
+    doc = {"records": recs}
+    # whole-file JSON, and JSONL with the compiled reader reused across lines
+    assert list(S.planned_records(doc, plan, to_records, parse_bbox)) == list(to_records(doc))
+    reader = S.plan_reader(plan, to_records, parse_bbox)
+    lines = [json.loads(json.dumps(r)) for r in recs]
+    assert [r for o in lines for r in reader(o)] == [r for o in lines for r in to_records(o)]
+
+def test_meta_plan_yields_to_a_top_level_image():
+    recs = [{"meta": {"file_name": f"a/s{i}.png"}, "objects": [{"label": "x", "bbox": [0, 0, 5, 5]}]} for i in range(4)]
+    plan = S.infer_plan(recs)
+    assert plan["image"] == "meta.file_name"
+    recs += [{"meta": {"image": "a/m.png", "file_name": "a/f.png"}, "objects": [{"label": "x", "bbox": [0, 0, 5, 5]}]},
+             {"path": "top.png", "meta": {"file_name": "a/f.png"}, "objects": [{"label": "x", "bbox": [0, 0, 5, 5]}]}]
+    assert S.plan_reader(plan, to_records, parse_bbox)(recs) == list(to_records(recs))
+
+@pytest.mark.parametrize("img", ["a/b.png", "b.png", "a/./", "x/.", "/x/..", "", "a//b", "dir\\f.png", "a/b.png/", 12])
+def test_image_name_matches_path_name(img):
+    from pathlib import Path
+    assert S._image_name(img) == Path(str(img)).name
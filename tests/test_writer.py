@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from tools import writer
+from tools.writer import OutputWriter
+
+def _tmp_files(root):
+    return [p.name for p in root.rglob("*.tmp")]
+
+def test_replaces_atomically_and_leaves_no_temp_files(tmp_path):
+    (tmp_path/"a.txt").write_text("old")
+    (tmp_path/"src.png").write_bytes(b"\x89PNG")
+    with OutputWriter(workers=4) as out:
+        out.write_text(tmp_path/"a.txt", "new")
+        out.write_bytes(tmp_path/"b.bin", b"\x00\x01")
+        out.copy(tmp_path/"src.png", tmp_path/"c.png")
+    assert (tmp_path/"a.txt").read_text() == "new"
+    assert (tmp_path/"b.bin").read_bytes() == b"\x00\x01"
+    assert (tmp_path/"c.png").read_bytes() == b"\x89PNG"
+    assert out.written == 3
+    assert _tmp_files(tmp_path) == []
+
+def test_same_destination_last_call_wins(tmp_path):
+    dst = tmp_path/"label.txt"
+    for _ in range(5):
+        with OutputWriter(workers=8) as out:
+            for i in range(200):
+                out.write_text(dst, "x" * (200 - i) + str(i))   # early writes are the slow, big ones
+        assert dst.read_text() == "x" + "199"
+    assert _tmp_files(tmp_path) == []
+
+def test_failed_write_is_raised_on_exit(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        with OutputWriter() as out:
+            out.write_text(tmp_path/"missing_dir/a.txt", "x")
+            out.write_text(tmp_path/"ok.txt", "x")
+    assert (tmp_path/"ok.txt").read_text() == "x"
+    assert _tmp_files(tmp_path) == []
+
+def test_failed_write_is_raised_on_next_call(tmp_path):
+    out = OutputWriter()
+    out.write_text(tmp_path/"missing_dir/a.txt", "x")
+    out._pool.shutdown(wait=True)   # let the failure land
+    with pytest.raises(FileNotFoundError):
+        out.write_text(tmp_path/"ok.txt", "x")
+    with pytest.raises(FileNotFoundError):
+        out.close()
+
+def test_blocks_at_max_pending(tmp_path, monkeypatch):
+    release, started = threading.Event(), threading.Semaphore(0)
+    def slow_write(dst, data):
+        started.release(); release.wait(5)
+        dst.write_bytes(data)
+    monkeypatch.setattr(writer, "atomic_write_bytes", slow_write)
+    calls = []
+    def produce(out):
+        for i in range(3):
+            out.write_bytes(tmp_path/f"{i}.txt", b"x"); calls.append(i)
+    with OutputWriter(workers=1, max_pending=2) as out:
+        t = threading.Thread(target=produce, args=(out,)); t.start()
+        assert started.acquire(timeout=5)
+        t.join(0.2)
+        assert calls == [0, 1] and t.is_alive()   # third call waits for a free slot
+        release.set(); t.join(5)
+    assert calls == [0, 1, 2]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["0.txt", "1.txt", "2.txt"]
@@ -0,0 +1,29 @@
+from tools.yolo_dataset import YoloDataset
+
+def _dataset(root):
+    # s0: one big box, s1: one tiny box, s2: no label file
+    (root/"train/images").mkdir(parents=True); (root/"train/labels").mkdir(parents=True)
+    for n in ("s0", "s1", "s2"): (root/f"train/images/{n}.png").write_bytes(b"")
+    (root/"train/labels/s0.txt").write_text("0 0.5 0.5 0.8 0.8\n1 0.1 0.1 0.01 0.01")
+    (root/"train/labels/s1.txt").write_text("1 0.2 0.2 0.01 0.01")
+    (root/"data.yaml").write_text("names: [a, b]\nnc: 2\ntrain: train/images\n")
+    return YoloDataset(root/"data.yaml", cache_dir=None)
+
+def test_lengths_and_labels(tmp_path):
+    ds = _dataset(tmp_path)
+    assert ds.lengths() == {"train": 3}
+    assert ds["train"].labels(2).shape == (0, 5)
+    assert ds["train"].class_counts(ds.nc).tolist() == [1, 2]
+
+def test_filter_by_area_needs_a_box_in_range(tmp_path):
+    tr = _dataset(tmp_path)["train"]
+    assert list(tr.filter(max_area=1e-9)) == []
+    # the tiny box on s0 is dropped from its labels
+    assert [(i, lab[:,0].tolist()) for i, _, lab in tr.filter(min_area=0.5)] == [(0, [0.0])]
+    assert [i for i, _, _ in tr.filter(max_area=1e-3)] == [0, 1]
+
+def test_filter_by_class_and_count(tmp_path):
+    tr = _dataset(tmp_path)["train"]
+    assert [i for i, _, _ in tr.filter(classes=[1])] == [0, 1]
+    assert [i for i, _, _ in tr.filter(min_boxes=2)] == [0]
+    assert [i for i, _, _ in tr.filter(max_boxes=0)] == [2]
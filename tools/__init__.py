@@ -0,0 +1,8 @@
+# tools/__init__.py
+"""
+Dataset tools for the UI element detector: downloaders, converters to YOLO labels, caches.
+
+Every module works both ways: as a script (`python tools/rico_to_yolo.py`, sibling imports
+resolved from tools/) and as part of this package (`import tools.rico_to_yolo`, relative
+imports), with no work done at import. `python tools --help` lists the CLI commands.
+"""
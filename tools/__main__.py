@@ -0,0 +1,119 @@
+# tools/__main__.py
+"""
+One entry point for the scripts in tools/:
+
+  python tools pull rico|rico-stream|ui-vision            # Hugging Face hub -> data_raw/
+  python tools convert rico|uiv-any|uiv-basic|uivision     # data_raw/ -> data_yolo/
+  python tools convert rico-cached [--cache ...]           # data_yolo/ labels from the Rico node cache
+  python tools stats [--data dataset.yaml] [--classes]     # split sizes (+ boxes per class)
+  python tools pack rico-cache|cp-bank|cp-render|subset ...  # packed/derived training artifacts
+  python tools bench ...                                   # tools/bench.py
+
+`python -m tools ...` from the project root works too. Only argparse is imported up
+front: each command imports its module when it runs, and the modules do no work at
+import (no downloads, no mkdirs; datasets/numpy/PIL/tqdm/yaml load inside the functions
+that use them), so --help and `stats` start quickly. The same modules import as a library with
+`import tools.<module>` (tests/test_imports.py checks both ways). pack/bench pass
+everything after the target to that tool's own parser; `pack <target> --help` shows the
+options of the step the target runs.
+"""
+import argparse, os, sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+PULL = {   # target -> module with main(); rico-stream also takes max_per_split
+    "rico": "hf_pull_rico",
+    "rico-stream": "hf_stream_save_rico",
+    "ui-vision": "hf_pull_ui_vision",
+}
+CONVERT = {   # target -> (module, name of its "how many" kwarg)
+    "rico": ("rico_to_yolo", None),
+    "uiv-any": ("uiv_any_to_yolo", "max_files"),
+    "uiv-basic": ("uiv_basic_to_yolo", "max_images"),
+    "uivision": ("uivision_to_yolo", "max_images"),
+}
+PACK = {   # target -> (module, argv prefix for its main(argv))
+    "rico-cache": ("rico_cache", ["build"]),
+    "cp-bank": ("copy_paste_bank", ["bank"]),
+    "cp-render": ("copy_paste_bank", ["render"]),
+    "subset": ("select_subset", []),
+}
+
+def _mod(name):
+    # `python -m tools`: tools.<name>; `python tools`: tools/ is sys.path[0], plain <name>
+    from importlib import import_module
+    return import_module("." + name, __package__) if __package__ else import_module(name)
+
+def _run(module, *a, **kw):
+    return _mod("profiling").run(_mod(module).main, *a, **kw)
+
+def cmd_pull(a):
+    if a.target == "rico-stream" and a.max is not None:
+        return _run(PULL[a.target], max_per_split=a.max or None)
+    return _run(PULL[a.target])
+
+def cmd_convert(a):
+    if a.target == "rico-cached":
+        return _run("rico_cache", ["relabel"] + (["--cache", a.cache] if a.cache else []))
+    module, limit = CONVERT[a.target]
+    kw = {"seed": a.seed} if limit else {}
+    if limit and a.max: kw[limit] = a.max
+    return _run(module, **kw)
+
+def cmd_stats(a):
+    ds = _mod("yolo_dataset").YoloDataset(a.data)
+    print(f"{ds.yaml}  nc={ds.nc}  root={ds.root}")
+    for s, n in ds.lengths().items():
+        print(f"  {s:<5} {n:>8} images  {ds[s].img_dir}")
+        if a.classes:
+            counts = ds[s].class_counts(ds.nc)
+            print("        " + "  ".join(f"{name}={c}" for name, c in zip(ds.names, counts.tolist())))
+
+def cmd_pack(a):
+    module, prefix = PACK[a.target]
+    return _run(module, prefix + a.args, prog=f"tools pack {a.target}")
+
+def cmd_bench(a):
+    return _run("bench", a.args)
+
+def build_parser():
+    ap = argparse.ArgumentParser(prog="tools", description="Dataset tools for the UI element detector.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("pull", help="download raw datasets from the Hugging Face hub")
+    p.add_argument("target", choices=sorted(PULL))
+    p.add_argument("--max", type=int, help="rico-stream: rows per split (0 = all; default: the script's small test batch)")
+    p.set_defaults(fn=cmd_pull)
+
+    p = sub.add_parser("convert", help="convert raw annotations to YOLO labels in data_yolo/")
+    p.add_argument("target", choices=sorted(CONVERT) + ["rico-cached"])
+    p.add_argument("--max", type=int, help="UI-Vision converters: cap on images")
+    p.add_argument("--seed", type=int, default=0, help="UI-Vision converters: split shuffle seed")
+    p.add_argument("--cache", help="rico-cached: node cache built by `pack rico-cache`")
+    p.set_defaults(fn=cmd_convert)
+
+    p = sub.add_parser("stats", help="split sizes of a YOLO data yaml")
+    p.add_argument("--data", default=os.path.join(os.path.dirname(HERE), "dataset.yaml"))
+    p.add_argument("--classes", action="store_true", help="also count boxes per class (reads every label)")
+    p.set_defaults(fn=cmd_stats)
+
+    p = sub.add_parser("pack", help="build caches, copy-paste banks/composites, training subsets")
+    p.add_argument("target", choices=sorted(PACK))
+    p.add_argument("args", nargs=argparse.REMAINDER, help="passed on to the tool (try: pack <target> --help)")
+    p.set_defaults(fn=cmd_pack)
+
+    p = sub.add_parser("bench", help="offline converter benchmarks (tools/bench.py)", add_help=False)
+    p.add_argument("args", nargs=argparse.REMAINDER)
+    p.set_defaults(fn=cmd_bench)
+    return ap
+
+def main(argv=None):
+    ap = build_parser()
+    # REMAINDER doesn't pick up a leading option (`bench --only rico`), so collect those too
+    a, extra = ap.parse_known_args(argv)
+    if extra and not hasattr(a, "args"): ap.error("unrecognized arguments: " + " ".join(extra))
+    if extra: a.args = extra + a.args
+    return a.fn(a)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+# tools/bench.py
+"""
+Offline CPU benchmarks for the converters, on synthetic fixtures.
+
+  python tools/bench.py                      # run everything, print a table
+  python tools/bench.py --save               # ... and store results as the baseline
+  python tools/bench.py --check              # ... and fail if a bench got slower than --tolerance
+  python tools/bench.py --only rico,e2e --nodes 2000
+
+Rico view hierarchies are generated in every shape rico_to_yolo accepts (nested JSON,
+columnar JSON, XML wrapped in a JSON string); UI-Vision annotations in every schema the
+uiv_* converters read. Nothing is downloaded.
+"""
+import argparse, contextlib, io, json, os, random, sys, tempfile, time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+BASELINE = HERE / "bench_baseline.json"
+
+RICO_CLASSES = [
+    "android.widget.Button", "android.widget.ImageButton", "android.widget.TextView",
+    "android.widget.ImageView", "android.widget.EditText", "android.widget.FrameLayout",
+    "android.widget.LinearLayout", "android.widget.RelativeLayout", "android.view.View",
+    "android.support.v7.widget.AppCompatTextView", "android.support.design.widget.FloatingActionButton",
+]
+RES_IDS = ["", "com.app:id/title", "com.app:id/btn_ok", "com.app:id/search_input", "com.app:id/avatar",
+           "com.app:id/container", "com.app:id/caption", "com.app:id/message"]
+UIV_LABELS = ["button", "input field", "icon", "heading", "text", "link", "checkbox", "container",
+              "label", "dropdown", "tab", "image"]
+W, H = 1440, 2560
+
+# ---------------- fixtures ----------------
+
+def _rand_box(rng, w=W, h=H):
+    x1 = rng.randrange(0, w-40); y1 = rng.randrange(0, h-40)
+    return [x1, y1, rng.randrange(x1+1, min(w, x1+600)), rng.randrange(y1+1, min(h, y1+300))]
+
+def _node_fields(rng):
+    return rng.choice(RICO_CLASSES), _rand_box(rng), rng.choice(RES_IDS), rng.choice(["", "Open menu", "profile picture", "Send"])
+
+def rico_nested(n, rng, fanout=4):
+    """Nested dict tree of n nodes, Rico-style keys."""
+    def node():
+        cls, b, rid, desc = _node_fields(rng)
+        return {"class": cls, "bounds": b, "resource_id": rid, "content_desc": [desc], "children": []}
+    root = node(); queue = [root]; made = 1
+    while made < n:
+        parent = queue.pop(0)
+        for _ in range(fanout):
+            if made >= n: break
+            ch = node(); parent["children"].append(ch); queue.append(ch); made += 1
+    return {"activity_name": "com.app/.Main", "activity": {"root": root}}
+
+def rico_columnar(n, rng):
+    """One dict of parallel lists (the HF `activity` column layout)."""
+    cols = {"klass": [], "bounds": [], "resource_id": [], "content_desc": []}
+    for _ in range(n):
+        cls, b, rid, desc = _node_fields(rng)
+        cols["klass"].append(cls); cols["bounds"].append(b)
+        cols["resource_id"].append(rid); cols["content_desc"].append(desc)
+    return cols
+
+def rico_xml(n, rng, fanout=4):
+    """uiautomator-style dump with [x1,y1][x2,y2] bounds."""
+    out = ['<?xml version="1.0" encoding="UTF-8"?><hierarchy rotation="0">']
+    def emit(k, left):
+        cls, b, rid, desc = _node_fields(rng)
+        out.append(f'<node index="{k}" class="{cls}" resource-id="{rid}" content-desc="{desc}" '
+                   f'bounds="[{b[0]},{b[1]}][{b[2]},{b[3]}]">')
+        left -= 1
+        kids = min(fanout, left)
+        for i in range(kids):
+            share = left // (kids - i)
+            emit(i, share); left -= share
+        out.append("</node>")
+    emit(0, n)
+    out.append("</hierarchy>")
+    return "".join(out)
+
+RICO_SHAPES = {
+    "nested":   lambda n, rng: json.dumps(rico_nested(n, rng)),
+    "columnar": lambda n, rng: json.dumps(rico_columnar(n, rng)),
+    "xml_str":  lambda n, rng: json.dumps(rico_xml(n, rng)),
+}
+
+def _uiv_obj(rng, style):
+    lbl = rng.choice(UIV_LABELS); x1, y1, x2, y2 = _rand_box(rng, 1920, 1080)
+    if style == "bbox_xyxy": return {"label": lbl, "bbox": [x1, y1, x2, y2]}
+    if style == "bbox_xywh": return {"category": lbl, "bbox": [x1, y1, x2-x1, y2-y1]}
+    if style == "xywh":      return {"class": lbl, "x": x1, "y": y1, "width": x2-x1, "height": y2-y1}
+    if style == "x1y2":      return {"name": lbl, "x1": x1, "y1": y1, "x2": x2, "y2": y2}
+    return {"type": lbl, "coords": [x1, y1, x2, y2]}
+
+UIV_SCHEMAS = ("records", "data_list", "basic_rows", "jsonl", "image_keyed")
+UIV_STYLES  = ("bbox_xyxy", "bbox_xywh", "xywh", "x1y2", "coords")
+
+def uiv_annotations(schema, n_images, per_image, rng, styles=UIV_STYLES):
+    """Returns (file suffix, text) for one annotation file in the given schema (objects mix `styles`)."""
+    names = [f"screen_{i:06d}.png" for i in range(n_images)]
+    if schema == "basic_rows":  # element_grounding_basic.json: one row per element
+        rows = [{"image_path": f"images/{nm}", "bbox": _uiv_obj(rng, "bbox_xyxy")["bbox"],
+                 "element_type": rng.choice(UIV_LABELS), "instruction": "click it"}
+                for nm in names for _ in range(per_image)]
+        return ".json", json.dumps(rows)
+    recs = [{"objs": [_uiv_obj(rng, rng.choice(styles)) for _ in range(per_image)], "nm": nm} for nm in names]
+    if schema == "records":
+        return ".json", json.dumps({"records": [{"image": r["nm"], "objects": r["objs"]} for r in recs]})
+    if schema == "data_list":
+        return ".json", json.dumps({"data": [{"file_name": f"imgs/{r['nm']}", "elements": r["objs"]} for r in recs]})
+    if schema == "jsonl":
+        return ".jsonl", "\n".join(json.dumps({"image_name": r["nm"], "bboxes": r["objs"]}) for r in recs)
+    if schema == "image_keyed":  # {"<image>": [objects...]} (uivision_to_yolo.load_records)
+        return ".json", json.dumps({r["nm"]: r["objs"] for r in recs})
+    raise ValueError(schema)
+
+def write_png(path: Path, w=W//4, h=H//4):
+    from PIL import Image
+    Image.new("RGB", (w, h), (240, 240, 240)).save(path)
+
+# ---------------- timing ----------------
+
+def timeit(fn, min_time=0.25, repeat=3):
+    """Best seconds/call over `repeat` rounds of at least `min_time` each."""
+    best = float("inf")
+    for _ in range(repeat):
+        reps = 0; t0 = time.perf_counter()
+        while True:
+            fn(); reps += 1
+            dt = time.perf_counter() - t0
+            if dt >= min_time: break
+        best = min(best, dt/reps)
+    return best
+
+@contextlib.contextmanager
+def _quiet():
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+@contextlib.contextmanager
+def _chdir(p):
+    old = os.getcwd(); os.chdir(p)
+    try: yield
+    finally: os.chdir(old)
+
+# ---------------- benches ----------------
+# each yields (name, seconds_per_call, items_per_call, unit)
+
+def bench_rico_stages(a, rng):
+    import rico_to_yolo as R
+    for shape, make in RICO_SHAPES.items():
+        txt = make(a.nodes, rng)
+        yield f"rico.json_loads.{shape}", timeit(lambda: json.loads(txt), a.min_time), a.nodes, "nodes"
+        data = json.loads(txt)
+        if shape == "xml_str":
+            yield "rico.extract_xml_boxes", timeit(lambda: R.extract_xml_boxes(data, []), a.min_time), a.nodes, "nodes"
+        else:
+            yield f"rico.extract_json_boxes.{shape}", timeit(lambda: R.extract_json_boxes(data, []), a.min_time), a.nodes, "nodes"
+    samples = ["[10,20][300,400]", [10, 20, 300, 400], {"left": 1, "top": 2, "right": 3, "bottom": 4},
+               {"x": 1, "y": 2, "width": 3, "height": 4}, {"boundsInScreen": "[1,2][3,4]"}]
+    batch = samples * 200
+    yield "rico.parse_bounds_any", timeit(lambda: [R.parse_bounds_any(b) for b in batch], a.min_time), len(batch), "bounds"
+
+def bench_uiv_stages(a, rng):
+    import uiv_any_to_yolo as A, uiv_schema as S
+    per = a.boxes
+    for schema in UIV_SCHEMAS:
+        suffix, txt = uiv_annotations(schema, a.records, per, rng)
+        if schema == "image_keyed":  # not a layout to_records understands; uivision_to_yolo reads it from disk
+            import uivision_to_yolo as U
+            p = Path(f"uiv_{schema}{suffix}"); p.write_text(txt, encoding="utf-8")
+            yield f"uiv.load_records.{schema}", timeit(lambda: U.load_records(p), a.min_time), a.records, "images"
+            continue
+        if schema == "basic_rows":  # flat element rows: to_records finds no records; time uiv_basic_to_yolo's grouping
+            import uiv_basic_to_yolo as B
+            rows = json.loads(txt)
+            index = {f"screen_{i:06d}.png": Path(f"screen_{i:06d}.png") for i in range(a.records)}
+            yield f"uiv.group_rows.{schema}", timeit(lambda: B.group_rows(rows, index), a.min_time), a.records, "images"
+            continue
+        if suffix == ".jsonl":
+            objs = [json.loads(l) for l in txt.splitlines()]
+            fn = lambda: [list(A.to_records(o)) for o in objs]
+        else:
+            obj = json.loads(txt)
+            fn = lambda: list(A.to_records(obj))
+        yield f"uiv.to_records.{schema}", timeit(fn, a.min_time), a.records, "images"
+    # uiv_any_to_yolo reads a file through a plan when it keeps to one object style (uiv_schema.py)
+    for style in UIV_STYLES:
+        objs = [json.loads(l) for l in uiv_annotations("jsonl", a.records, per, rng, (style,))[1].splitlines()]
+        read = S.plan_reader(S.infer_plan(objs[:S.SAMPLE]), A.to_records, A.parse_bbox)
+        yield f"uiv.to_records.jsonl.{style}", timeit(lambda: [list(A.to_records(o)) for o in objs], a.min_time), a.records, "images"
+        yield f"uiv.planned_records.jsonl.{style}", timeit(lambda: [read(o) for o in objs], a.min_time), a.records, "images"
+    objs = [_uiv_obj(rng, s) for s in UIV_STYLES] * 200
+    yield "uiv.parse_bbox", timeit(lambda: [A.parse_bbox(o) for o in objs], a.min_time), len(objs), "objects"
+
+def _e2e_rico(a, rng, root):
+    import rico_to_yolo as R
+    img, js = root/"rico/screens", root/"rico/view_hierarchies"
+    img.mkdir(parents=True); js.mkdir(parents=True)
+    shapes = list(RICO_SHAPES.values())
+    for i in range(a.screens):
+        base = f"rico_{('train','validation','test')[i%3]}_{i:06d}"
+        write_png(img/f"{base}.png")
+        (js/f"{base}.json").write_text(shapes[i % len(shapes)](a.nodes, rng), encoding="utf-8")
+    R.RICO_IMG, R.RICO_JSON, R.OUT = img, js, root/"out_rico"
+    return R.main
+
+def _uiv_images(a, root):
+    imgs = root/"ui_vision/images"; imgs.mkdir(parents=True)
+    for i in range(a.records):
+        write_png(imgs/f"screen_{i:06d}.png", 480, 270)
+    return imgs
+
+def _e2e_uiv_any(a, rng, root):
+    import uiv_any_to_yolo as A
+    ann = root/"ui_vision/annotations"; ann.mkdir(parents=True)
+    files = []
+    for schema in ("records", "data_list", "basic_rows", "jsonl"):
+        suffix, txt = uiv_annotations(schema, a.records, a.boxes, rng)
+        p = ann/f"{schema}{suffix}"; p.write_text(txt, encoding="utf-8"); files.append(p)
+    A.ANN_FILES, A.IMG_ROOT, A.YOLO = files, root/"ui_vision/images", root/"out_any"
+    return A.main
+
+def _e2e_uiv_basic(a, rng, root):
+    import uiv_basic_to_yolo as B
+    p = root/"ui_vision/basic.json"
+    p.write_text(uiv_annotations("basic_rows", a.records, a.boxes, rng)[1], encoding="utf-8")
+    B.ANN, B.IMG_ROOT, B.YOLO = p, root/"ui_vision/images", root/"out_basic"
+    return B.main
+
+def _e2e_uivision(a, rng, root):
+    import uivision_to_yolo as U
+    p = root/"ui_vision/records.json"
+    p.write_text(uiv_annotations("records", a.records, a.boxes, rng)[1], encoding="utf-8")
+    U.ANN, U.IMG_ROOT, U.YOLO = p, root/"ui_vision/images", root/"out_uivision"
+    return U.main
+
+def bench_e2e(a, rng):
+    with tempfile.TemporaryDirectory(prefix="e2e_", dir=".") as tmp:
+        root = Path(tmp).resolve()
+        mains = {"rico_to_yolo": (_e2e_rico(a, rng, root), a.screens)}
+        _uiv_images(a, root)
+        mains["uiv_any_to_yolo"] = (_e2e_uiv_any(a, rng, root), a.records)
+        mains["uiv_basic_to_yolo"] = (_e2e_uiv_basic(a, rng, root), a.records)
+        mains["uivision_to_yolo"] = (_e2e_uivision(a, rng, root), a.records)
+        for name, (main, n) in mains.items():
+            with _quiet():
+                dt = timeit(main, min_time=0, repeat=a.e2e_repeat)
+            yield f"e2e.{name}", dt, n, "images"
+
+BENCHES = {"rico": bench_rico_stages, "uiv": bench_uiv_stages, "e2e": bench_e2e}
+SIZE_ARGS = ("nodes", "screens", "records", "boxes", "seed")   # stored with a baseline, must match to compare
+
+# ---------------- baselines ----------------
+
+def compare(results, baseline, tol):
+    """Returns names whose throughput dropped by more than tol vs the baseline."""
+    slower = []
+    for name, r in results.items():
+        b = baseline.get(name)
+        if not b: continue
+        ratio = r["per_s"] / b["per_s"] if b["per_s"] else 1.0
+        r["vs_baseline"] = round(ratio, 3)
+        if ratio < 1 - tol: slower.append(name)
+    return slower
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--only", default="", help="comma list of: " + ",".join(BENCHES))
+    ap.add_argument("--nodes", type=int, default=300, help="view nodes per Rico screen")
+    ap.add_argument("--screens", type=int, default=60, help="Rico screens for the end-to-end run")
+    ap.add_argument("--records", type=int, default=300, help="UI-Vision images per annotation file")
+    ap.add_argument("--boxes", type=int, default=8, help="UI-Vision objects per image")
+    ap.add_argument("--min-time", type=float, default=0.25, help="seconds per timing round")
+    ap.add_argument("--e2e-repeat", type=int, default=2)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--save", action="store_true", help="write results to --baseline")
+    ap.add_argument("--check", action="store_true", help="exit 1 on regressions vs --baseline, 2 if there is no comparable baseline")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed throughput drop (0.25 = 25%%)")
+    ap.add_argument("--json", type=Path, help="also write raw results here")
+    a = ap.parse_args(argv)
+
+    a.baseline = a.baseline.resolve()
+    if a.json: a.json = a.json.resolve()
+    sys.path.insert(0, str(HERE))
+    if a.check and a.save: ap.error("--check compares against the baseline that --save would overwrite; use one")
+    if a.check and not a.baseline.exists():
+        print("No baseline at", a.baseline, "- run with --save first")
+        return 2
+    base = None
+    if a.baseline.exists() and not a.save:
+        saved = json.loads(a.baseline.read_text(encoding="utf-8"))
+        # throughput only compares at the same fixture sizes
+        want = saved.get("meta", {}).get("args", {})
+        diff = {k: (want.get(k), getattr(a, k)) for k in SIZE_ARGS if want.get(k) != getattr(a, k)}
+        if diff:
+            print(f"Baseline {a.baseline} was recorded with other sizes (baseline, now): {diff}")
+            if a.check:
+                print("Refusing to --check; rerun with the baseline's sizes or --save a new one")
+                return 2
+            print("Not comparing against it")
+        else:
+            base = saved["results"]
+    only = [s for s in a.only.split(",") if s] or list(BENCHES)
+    results = {}
+    # the UI-Vision converters keep cwd-relative state (data_cache/uiv_schemas.json); run from a scratch dir
+    with tempfile.TemporaryDirectory(prefix="tools_bench_") as tmp, _chdir(tmp):
+        for key in only:
+            rng = random.Random(a.seed)
+            for name, sec, items, unit in BENCHES[key](a, rng):
+                results[name] = {"us_per_call": round(sec*1e6, 2), "per_s": round(items/sec, 1), "unit": unit}
+                print(f"{name:<36} {sec*1e3:>10.3f} ms/call  {items/sec:>12.1f} {unit}/s", flush=True)
+
+    rc = 0
+    if base is not None:
+        slower = compare(results, base, a.tolerance)
+        for name in slower:
+            print(f"REGRESSION {name}: {results[name]['vs_baseline']:.2f}x baseline throughput")
+        if a.check and slower: rc = 1
+    if a.save:
+        meta = {"python": sys.version.split()[0], "platform": sys.platform,
+                "args": {k: getattr(a, k) for k in SIZE_ARGS}}
+        a.baseline.write_text(json.dumps({"meta": meta, "results": results}, indent=2), encoding="utf-8")
+        print("Baseline saved to", a.baseline)
+    if a.json:
+        a.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return rc
+
+if __name__ == "__main__":
+    sys.exit(main())
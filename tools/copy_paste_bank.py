@@ -0,0 +1,213 @@
+# tools/copy_paste_bank.py
+"""
+Offline copy-paste for the rarest classes, instead of `copy_paste=` in the dataloader.
+
+  python tools/copy_paste_bank.py bank     # crop rare-class instances from Rico-1/train
+  python tools/copy_paste_bank.py render   # pre-render composites + a data.yaml that uses them
+
+`bank` crops every instance of the --rarest classes (by box count in the train split)
+into one packed file: bank.bin holds the PNG-encoded crops back to back, bank.json the
+index (class, offset, length, size, source image). `render` pastes bank crops onto random
+train screens in a process pool. Like ultralytics' copy-paste, a paste must not hide more
+than --max-cover (30%) of any box already there, original or pasted: its position is
+re-drawn up to PLACE_TRIES times, then the paste is skipped. Original labels are never
+dropped. Composites are written with the screen's labels plus the pastes', and data.yaml
+gets train = [original train, composites]. Train from that yaml with copy_paste=0.0;
+rare-class exposure is set by --composites and --pastes instead of by chance every epoch.
+"""
+import argparse, io, json, mmap, random
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from .yolo_dataset import PROJECT, YoloDataset, read_labels
+    from .profiling import get_profiler, run
+except ImportError:   # run as a script: python tools/copy_paste_bank.py
+    from yolo_dataset import PROJECT, YoloDataset, read_labels
+    from profiling import get_profiler, run
+
+DATA_YAML = PROJECT/"Rico-1/data.yaml"
+BANK_DIR  = PROJECT/"data_cache/cp_bank"
+OUT       = PROJECT/"data_cache/rico_cp"
+PLACE_TRIES = 10   # positions tried per paste before it is skipped
+
+# ---------------- bank ----------------
+
+def rarest_classes(ds, k):
+    import numpy as np
+    counts = ds["train"].class_counts(ds.nc)
+    return [int(c) for c in np.argsort(counts, kind="stable")[:k]], counts
+
+def _crop_instances(job):
+    import numpy as np
+    from PIL import Image
+    img_path, lbl_path, classes, min_px = job
+    lab = read_labels(lbl_path)
+    keep = np.isin(lab[:,0].astype(np.int64), classes)
+    if not keep.any(): return img_path.name, []
+    out = []
+    try:
+        im = Image.open(img_path).convert("RGB")
+    except OSError:
+        return img_path.name, None   # unreadable (e.g. an un-pulled git-lfs pointer)
+    with im:
+        W,H = im.size
+        for c, cx, cy, w, h in lab[keep].tolist():
+            x1 = max(0, round((cx-w/2)*W)); y1 = max(0, round((cy-h/2)*H))
+            x2 = min(W, round((cx+w/2)*W)); y2 = min(H, round((cy+h/2)*H))
+            if x2-x1 < min_px or y2-y1 < min_px: continue
+            buf = io.BytesIO()
+            im.crop((x1,y1,x2,y2)).save(buf, "PNG")
+            out.append((int(c), buf.getvalue(), x2-x1, y2-y1))
+    return img_path.name, out
+
+def build_bank(data_yaml=DATA_YAML, bank_dir=BANK_DIR, rarest=2, classes=None, min_px=8, workers=None):
+    prof = get_profiler("copy_paste_bank.bank")
+    ds = YoloDataset(data_yaml)
+    if classes is None:
+        classes, counts = rarest_classes(ds, rarest)
+        print("Train box counts:", dict(zip(ds.names, counts.tolist())))
+    print("Banking classes:", [ds.names[c] for c in classes])
+    bank_dir.mkdir(parents=True, exist_ok=True)
+    tr = ds["train"]
+    jobs = [(*tr[i], classes, min_px) for i in range(len(tr))]
+    entries = []; off = 0; bad = 0
+    with open(bank_dir/"bank.bin", "wb") as fh, ProcessPoolExecutor(workers) as pool:
+        for src, crops in pool.map(_crop_instances, jobs, chunksize=16):
+            prof.tick()
+            if crops is None:
+                bad += 1; continue
+            for c, png, w, h in crops:
+                fh.write(png)
+                entries.append([c, off, len(png), w, h, src]); off += len(png)
+    (bank_dir/"bank.json").write_text(json.dumps({
+        "data": str(Path(data_yaml).resolve()), "names": ds.names, "classes": classes,
+        "fields": ["cls","offset","length","w","h","source"], "entries": entries}), encoding="utf-8")
+    prof.finish()
+    per = {ds.names[c]: sum(1 for e in entries if e[0]==c) for c in classes}
+    print(f"Banked {len(entries)} crops ({off/1e6:.1f} MB) into {bank_dir}: {per}")
+    if bad:
+        print(f"Skipped {bad} unreadable images (git lfs pull?)")
+
+# ---------------- render ----------------
+
+_BANK = None   # per worker process: (index dict, mmap of bank.bin, {cls: [entry, ...]}, bases)
+
+def _init_render(bank_dir, bases):
+    global _BANK
+    idx = json.loads((bank_dir/"bank.json").read_text(encoding="utf-8"))
+    fh = open(bank_dir/"bank.bin", "rb")
+    by_cls = {}
+    for e in idx["entries"]: by_cls.setdefault(e[0], []).append(e)
+    _BANK = (idx, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ), by_cls, bases)
+
+def _covered(boxes, pastes):
+    # fraction of each (x1,y1,x2,y2) box hidden by the pasted boxes (overlaps summed, capped at 1)
+    import numpy as np
+    if not len(boxes) or not pastes: return np.zeros(len(boxes))
+    p = np.array(pastes, dtype=np.float64)
+    ix = np.clip(np.minimum(boxes[:,None,2], p[None,:,2]) - np.maximum(boxes[:,None,0], p[None,:,0]), 0, None)
+    iy = np.clip(np.minimum(boxes[:,None,3], p[None,:,3]) - np.maximum(boxes[:,None,1], p[None,:,1]), 0, None)
+    area = np.maximum((boxes[:,2]-boxes[:,0])*(boxes[:,3]-boxes[:,1]), 1e-9)
+    return np.minimum((ix*iy).sum(1) / area, 1.0)
+
+def _render_one(job):
+    import numpy as np
+    from PIL import Image
+    k, seed, n_paste, out_dir, scale, max_cover = job
+    idx, blob, by_cls, bases = _BANK
+    rng = random.Random(seed)
+    for _ in range(10):   # skip unreadable bases (git-lfs pointers) like `bank` does
+        img_path, lbl_path = bases[rng.randrange(len(bases))]
+        try:
+            with Image.open(img_path) as im:
+                im = im.convert("RGB")
+            break
+        except OSError:
+            continue
+    else:
+        raise OSError(f"no readable train images among {len(bases)} (git lfs pull?)")
+    lab = read_labels(Path(lbl_path))
+    W,H = im.size
+    # every box on the screen so far (originals, then accepted pastes) and how much of it is hidden
+    boxes = np.stack([(lab[:,1]-lab[:,3]/2)*W, (lab[:,2]-lab[:,4]/2)*H,
+                      (lab[:,1]+lab[:,3]/2)*W, (lab[:,2]+lab[:,4]/2)*H], 1) if len(lab) else np.zeros((0,4))
+    hidden = np.zeros(len(boxes))
+    lines = [f"{int(c)} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}" for c, cx, cy, w, h in lab.tolist()]
+    classes = [c for c in idx["classes"] if by_cls.get(c)]
+    placed = 0
+    for _ in range(n_paste):
+        c = classes[rng.randrange(len(classes))]   # uniform over rare classes, not over crops
+        _, off, ln, w, h, _ = by_cls[c][rng.randrange(len(by_cls[c]))]
+        s = rng.uniform(*scale)
+        w2, h2 = min(W, max(2, round(w*s))), min(H, max(2, round(h*s)))
+        for _ in range(PLACE_TRIES):
+            x1 = rng.randrange(0, W-w2+1); y1 = rng.randrange(0, H-h2+1)
+            more = hidden + _covered(boxes, [(x1, y1, x1+w2, y1+h2)])
+            if (more <= max_cover).all(): break
+        else:
+            continue   # no spot leaves every box below max_cover hidden: skip this paste
+        crop = Image.open(io.BytesIO(blob[off:off+ln])).convert("RGB")
+        if (w2, h2) != (w, h): crop = crop.resize((w2, h2), Image.BILINEAR)
+        im.paste(crop, (x1, y1))
+        boxes = np.vstack([boxes, (x1, y1, x1+w2, y1+h2)]); hidden = np.append(more, 0.0)
+        lines.append(f"{c} {(x1+x1+w2)/2/W:.6f} {(y1+y1+h2)/2/H:.6f} {w2/W:.6f} {h2/H:.6f}")
+        placed += 1
+    name = f"cp_{k:06d}"
+    im.save(out_dir/"images"/f"{name}.jpg", quality=92)
+    (out_dir/"labels"/f"{name}.txt").write_text("\n".join(lines), encoding="utf-8")
+    return placed
+
+def render(bank_dir=BANK_DIR, out=OUT, composites=2000, pastes=4, scale=(0.8, 1.25), max_cover=0.3,
+           seed=0, workers=None):
+    import yaml
+    prof = get_profiler("copy_paste_bank.render")
+    idx = json.loads((bank_dir/"bank.json").read_text(encoding="utf-8"))
+    if not idx["entries"]:
+        print("Bank is empty; run `bank` first (or lower --min-px)."); return
+    ds = YoloDataset(idx["data"])
+    tr = ds["train"]
+    bases = [tuple(map(str, tr[i])) for i in range(len(tr))]
+    for d in ("images", "labels"): (out/d).mkdir(parents=True, exist_ok=True)
+    jobs = [(k, seed*1_000_003 + k, pastes, out, scale, max_cover) for k in range(composites)]
+    placed = 0
+    with ProcessPoolExecutor(workers, initializer=_init_render, initargs=(bank_dir, bases)) as pool:
+        for n in pool.map(_render_one, jobs, chunksize=8):
+            prof.tick(); placed += n
+    cfg = {"path": str(out), "names": ds.names, "nc": ds.nc,
+           "train": [str(tr.img_dir), str(out/"images")]}
+    for s in ("val", "test"):
+        if s in ds: cfg[s] = str(ds[s].img_dir)
+    (out/"data.yaml").write_text(yaml.safe_dump(cfg, sort_keys=False), encoding="utf-8")
+    prof.finish()
+    print(f"Rendered {composites} composites with {placed} rare-class pastes into {out}")
+    print(f"Train with data={out/'data.yaml'} and copy_paste=0.0")
+
+def main(argv=None, prog=None):
+    # prog: the subcommand's usage name when a caller supplies the subcommand (`tools pack cp-bank`)
+    ap = argparse.ArgumentParser(description="Offline copy-paste bank for rare classes.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    text = "crop rare-class instances from the train split into bank.bin + bank.json"
+    b = sub.add_parser("bank", help=text, description=text, prog=prog)
+    b.add_argument("--data", type=Path, default=DATA_YAML)
+    b.add_argument("--rarest", type=int, default=2, help="bank the k classes with the fewest train boxes")
+    b.add_argument("--classes", type=lambda s: [int(c) for c in s.split(",")], help="explicit class ids instead")
+    b.add_argument("--min-px", type=int, default=8, help="skip crops smaller than this")
+    text = "paste bank crops onto train screens; write composites and a data.yaml using them"
+    r = sub.add_parser("render", help=text, description=text, prog=prog)
+    r.add_argument("--out", type=Path, default=OUT)
+    r.add_argument("--composites", type=int, default=2000)
+    r.add_argument("--pastes", type=int, default=4, help="crops pasted per composite")
+    r.add_argument("--max-cover", type=float, default=0.3, help="largest share of any box a paste may hide")
+    r.add_argument("--seed", type=int, default=0)
+    for p in (b, r):
+        p.add_argument("--bank", type=Path, default=BANK_DIR)
+        p.add_argument("--workers", type=int, default=None)
+    a = ap.parse_args(argv)
+    if a.cmd == "bank":
+        build_bank(a.data, a.bank, a.rarest, a.classes, a.min_px, a.workers)
+    else:
+        render(a.bank, a.out, a.composites, a.pastes, max_cover=a.max_cover, seed=a.seed, workers=a.workers)
+
+if __name__ == "__main__":
+    run(main)
@@ -1,9 +1,6 @@
 # tools/hf_stream_save_rico.py
-from datasets import load_dataset
 from pathlib import Path
-from PIL import Image
 import json
-from tqdm import tqdm
 
 # grab a small batch first to test; set to None later to pull everything
 MAX_PER_SPLIT = 50
@@ -14,10 +11,13 @@ CFG  = "ui-screenshots-and-view-hierarchies"
 ROOT = Path(__file__).resolve().parents[1]  # project root
 DST_IMG  = ROOT / "data_raw" / "rico" / "screens"
 DST_JSON = ROOT / "data_raw" / "rico" / "view_hierarchies"
-DST_IMG.mkdir(parents=True, exist_ok=True)
-DST_JSON.mkdir(parents=True, exist_ok=True)
 
-def save_split(split: str) -> int:
+def save_split(split: str, max_per_split=MAX_PER_SPLIT) -> int:
+    from datasets import load_dataset
+    from PIL import Image
+    from tqdm import tqdm
+    DST_IMG.mkdir(parents=True, exist_ok=True)
+    DST_JSON.mkdir(parents=True, exist_ok=True)
     try:
         ds = load_dataset(REPO, name=CFG, split=split, streaming=True)
     except Exception as e:
@@ -58,13 +58,17 @@ def save_split(split: str) -> int:
             (DST_JSON / f"{base}.json").write_text(str(vh), encoding="utf-8")
 
         saved += 1
-        if MAX_PER_SPLIT is not None and saved >= MAX_PER_SPLIT:
+        if max_per_split is not None and saved >= max_per_split:
             break
 
     print(f"[{split}] saved {saved} pairs.")
     return saved
 
-total = 0
-for split in ("train","validation","test"):
-    total += save_split(split)
-print(f"Total saved: {total} PNG+JSON pairs into {DST_IMG.parent}")
+def main(max_per_split=MAX_PER_SPLIT):
+    total = 0
+    for split in ("train","validation","test"):
+        total += save_split(split, max_per_split)
+    print(f"Total saved: {total} PNG+JSON pairs into {DST_IMG.parent}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# tools/profiling.py
+"""
+Opt-in stage timing for the converters. Everything is off unless the env asks for it:
+
+  TOOLS_PROFILE=out.json    record per-stage counters/histograms, dump JSON at exit
+  TOOLS_PROFILE_EVERY=5     seconds between progress/throughput lines (0 = silent)
+  TOOLS_CPROFILE=out.prof   run main() under cProfile (open with snakeviz / pstats)
+
+For sampling, py-spy needs no hook: `py-spy record -o prof.svg -- python tools/rico_to_yolo.py`.
+Stages are timed in plain functions, so they show up by name in its flame graphs too.
+"""
+import atexit, cProfile, json, math, os, sys, time
+from contextlib import contextmanager, nullcontext
+
+_NULL = nullcontext()
+N_BUCKETS = 24  # log2 buckets over microseconds: [<1us, 1-2us, 2-4us, ... >=2^22us (~4s)]
+
+def _bucket(us: float) -> int:
+    if us < 1: return 0
+    return min(N_BUCKETS-1, int(math.log2(us)) + 1)
+
+class Stage:
+    __slots__ = ("calls","total","min","max","hist")
+    def __init__(self):
+        self.calls = 0; self.total = 0.0
+        self.min = math.inf; self.max = 0.0
+        self.hist = [0]*N_BUCKETS
+
+    def add(self, dt: float):
+        self.calls += 1; self.total += dt
+        if dt < self.min: self.min = dt
+        if dt > self.max: self.max = dt
+        self.hist[_bucket(dt*1e6)] += 1
+
+    def as_dict(self):
+        return {
+            "calls": self.calls, "total_s": round(self.total, 6),
+            "mean_us": round(self.total/self.calls*1e6, 2) if self.calls else 0.0,
+            "min_us": round(self.min*1e6, 2) if self.calls else 0.0,
+            "max_us": round(self.max*1e6, 2),
+            # key = upper edge of the bucket in microseconds
+            "hist_us": {str(2**i): c for i, c in enumerate(self.hist) if c},
+        }
+
+class Profiler:
+    """Per-stage timers + counters. When disabled every method is a cheap no-op."""
+    def __init__(self, name: str, enabled=False, out=None, every=5.0, stream=sys.stderr):
+        self.name = name; self.enabled = enabled
+        self.out = out; self.every = every; self.stream = stream
+        self.stages = {}; self.counters = {}
+        self.items = 0
+        self.t0 = self._last = time.perf_counter()
+        self._last_items = 0
+        self._done = False
+
+    @contextmanager
+    def _timed(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t)
+
+    def add(self, name: str, dt: float):
+        """Record one call of `name` that took dt seconds, timed elsewhere (e.g. a worker thread)."""
+        if not self.enabled: return
+        st = self.stages.get(name)
+        if st is None: st = self.stages.setdefault(name, Stage())
+        st.add(dt)
+
+    def stage(self, name: str):
+        # `with prof.stage("parse_json"): ...`
+        return self._timed(name) if self.enabled else _NULL
+
+    def count(self, name: str, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def tick(self, n=1):
+        """Mark n input items as processed; prints a progress line every `every` seconds."""
+        if not self.enabled: return
+        self.items += n
+        if self.every:
+            now = time.perf_counter()
+            if now - self._last >= self.every:
+                self._progress(now)
+
+    def _progress(self, now):
+        rate = (self.items - self._last_items) / max(now - self._last, 1e-9)
+        ctr = " ".join(f"{k}={v}" for k, v in sorted(self.counters.items()))
+        print(f"[{self.name}] {self.items} items  {rate:.1f}/s  {now-self.t0:.1f}s  {ctr}".rstrip(),
+              file=self.stream, flush=True)
+        self._last = now; self._last_items = self.items
+
+    def report(self):
+        wall = time.perf_counter() - self.t0
+        return {
+            "name": self.name, "wall_s": round(wall, 6), "items": self.items,
+            "items_per_s": round(self.items/wall, 2) if wall > 0 else 0.0,
+            "counters": dict(self.counters),
+            "stages": {k: v.as_dict() for k, v in self.stages.items()},
+        }
+
+    def finish(self):
+        """Print a stage summary and dump the JSON profile (once)."""
+        if not self.enabled or self._done: return
+        self._done = True
+        rep = self.report()
+        for k, v in sorted(rep["stages"].items(), key=lambda kv: -kv[1]["total_s"]):
+            print(f"[{self.name}] {k:<16} {v['calls']:>9} calls  {v['total_s']:>9.3f}s  {v['mean_us']:>10.1f}us/call",
+                  file=self.stream)
+        if self.out:
+            with open(self.out, "w", encoding="utf-8") as fh:
+                json.dump(rep, fh, indent=2)
+            print(f"[{self.name}] profile written to {self.out}", file=self.stream)
+
+def get_profiler(name: str) -> Profiler:
+    out = os.environ.get("TOOLS_PROFILE")
+    every = float(os.environ.get("TOOLS_PROFILE_EVERY", "5") or 0)
+    if not out:
+        return Profiler(name)
+    # TOOLS_PROFILE=1 -> default file name next to the cwd
+    if out.lower() in ("1", "true", "yes"): out = f"profile_{name}.json"
+    prof = Profiler(name, enabled=True, out=out, every=every)
+    atexit.register(prof.finish)  # still dump on early return / exceptions
+    return prof
+
+def run(fn, *args, **kwargs):
+    """Call fn(*args, **kwargs), under cProfile if TOOLS_CPROFILE is set."""
+    dst = os.environ.get("TOOLS_CPROFILE")
+    if not dst:
+        return fn(*args, **kwargs)
+    pr = cProfile.Profile()
+    try:
+        return pr.runcall(fn, *args, **kwargs)
+    finally:
+        pr.dump_stats(dst)
+        print(f"cProfile stats written to {dst}", file=sys.stderr)
@@ -0,0 +1,269 @@
+# tools/rico_cache.py
+"""
+Parse the Rico view hierarchies once, then relabel from a columnar cache.
+
+  python tools/rico_cache.py build      # one full pass over data_raw/rico -> data_cache/rico_nodes.npz
+  python tools/rico_cache.py relabel    # re-apply ANDROID_TO_CANON / guess_from_text -> data_yolo/
+
+`build` keeps every view node that has usable bounds (not only the ones the current
+class map accepts), as parallel arrays: class / resource-id / content-desc string ids
+into per-column vocabularies, int32 bounds, and per-screen offsets + image sizes. Strings
+(vocabularies, image names) are stored as one UTF-8 blob + end offsets each, not as
+fixed-width arrays padded to the longest string, and the .npz is compressed.
+`relabel` runs the mapping functions once per *distinct* string and does the rest
+(class lookup, id/desc fallback, clamping, normalization) with NumPy over all nodes,
+producing the same label files as `rico_to_yolo.py`.
+"""
+import argparse, json
+from pathlib import Path
+
+try:
+    from . import rico_to_yolo as R
+    from .profiling import get_profiler, run
+    from .writer import OutputWriter, yolo_dirs
+except ImportError:   # run as a script: python tools/rico_cache.py
+    import rico_to_yolo as R
+    from profiling import get_profiler, run
+    from writer import OutputWriter, yolo_dirs
+
+CACHE = R.PROJECT/"data_cache/rico_nodes.npz"
+SRC_JSON, SRC_XML = 0, 1  # text fallbacks (id/desc) only apply to JSON nodes, as in rico_to_yolo
+
+def _first(obj, keys):
+    # first candidate key (case-insensitive) holding a non-None value
+    for k in keys:
+        for key in obj.keys():
+            if key.lower()==k:
+                if obj[key] is not None: return obj[key]
+                break
+    return None
+
+def json_nodes(obj, out):
+    """Same walk as rico_to_yolo.extract_json_boxes, but keeps (cls, rid, desc, bb) for every node."""
+    if isinstance(obj, dict):
+        bounds_list = _first(obj, R.CAND_BOUNDS_KEYS)
+        klass_list  = _first(obj, R.CAND_CLASS_KEYS)
+        if isinstance(bounds_list, list) and bounds_list and isinstance(bounds_list[0], (list,tuple)):
+            rid_list  = R.try_get_list(obj, R.CAND_ID_KEYS)
+            desc_list = R.try_get_list(obj, R.CAND_DESC_KEYS)
+            for i in range(len(bounds_list)):
+                bb = R.select_bounds_at_index(obj, i)
+                if not bb: continue
+                x1,y1,x2,y2 = bb
+                if x2<=x1 or y2<=y1: continue
+                raw_cls = ""
+                if isinstance(klass_list, list) and i < len(klass_list):
+                    raw_cls = klass_list[i]
+                elif isinstance(klass_list, str):
+                    raw_cls = klass_list
+                rid = (rid_list[i] if i < len(rid_list) else "") or ""
+                des = (desc_list[i] if i < len(desc_list) else "") or ""
+                out.append((raw_cls or "", str(rid), str(des), bb, SRC_JSON))
+        else:
+            cls_str = None
+            for ck in R.CAND_CLASS_KEYS:
+                for key in obj.keys():
+                    if key.lower()==ck:
+                        v = obj[key]; cls_str = v[0] if isinstance(v, list) and v else v; break
+                if cls_str is not None: break
+            bb = None
+            for bk in R.CAND_BOUNDS_KEYS:
+                for key in obj.keys():
+                    if key.lower()==bk:
+                        v = obj[key]
+                        if isinstance(v, list) and v and isinstance(v[0], (list,tuple)):
+                            v = v[0]
+                        bb = R.parse_bounds_any(v)
+                        if bb: break
+                if bb: break
+            if bb and bb[2]>bb[0] and bb[3]>bb[1]:
+                rid_list  = R.try_get_list(obj, R.CAND_ID_KEYS)
+                desc_list = R.try_get_list(obj, R.CAND_DESC_KEYS)
+                out.append((cls_str or "", str(rid_list[0]) if rid_list else "",
+                            str(desc_list[0]) if desc_list else "", bb, SRC_JSON))
+        for v in obj.values():
+            if isinstance(v, (dict, list)):
+                json_nodes(v, out)
+    elif isinstance(obj, list):
+        for v in obj:
+            if isinstance(v, (dict, list)):
+                json_nodes(v, out)
+
+def xml_nodes(xml_text, out):
+    n0 = len(out)
+    try:
+        for el in R.iter_xml_starts(xml_text):
+            a = el.attrib
+            b = a.get("bounds")
+            if b is None: continue
+            m = R.XML_BOUNDS_RE.match(b)
+            bb = tuple(map(int, m.groups())) if m else R.parse_bounds_any(b)
+            if bb and bb[2]>bb[0] and bb[3]>bb[1]:
+                out.append((a.get("class") or a.get("className") or "",
+                            a.get("resource-id") or "", a.get("content-desc") or "", bb, SRC_XML))
+    except Exception:
+        del out[n0:]
+
+def screen_nodes(txt):
+    # mirrors the JSON / JSON-in-string / XML dispatch in rico_to_yolo.main()
+    nodes = []
+    try: data = json.loads(txt)
+    except Exception: data = None
+    if isinstance(data, dict):
+        json_nodes(data, nodes)
+    elif isinstance(data, str):
+        if "<" in data: xml_nodes(data, nodes)
+        else:
+            try: json_nodes(json.loads(data), nodes)
+            except Exception: pass
+    if not nodes and "<" in txt:
+        xml_nodes(txt, nodes)
+    return nodes
+
+class _Vocab(dict):
+    def id(self, s):
+        i = self.get(s)
+        if i is None: i = self[s] = len(self)
+        return i
+
+def _pack_strings(strs, name):
+    import numpy as np
+    # {name}_blob: uint8 UTF-8 bytes of all strings back to back, {name}_end: end offset of each
+    enc = [s.encode("utf-8") for s in strs]
+    return {f"{name}_blob": np.frombuffer(b"".join(enc), dtype=np.uint8),
+            f"{name}_end": np.cumsum([len(b) for b in enc], dtype=np.int64)}
+
+def _unpack_strings(z, name):
+    blob = z[f"{name}_blob"].tobytes(); ends = z[f"{name}_end"].tolist()
+    return [blob[a:b].decode("utf-8") for a, b in zip([0] + ends, ends)]
+
+STRINGS = ("image", "cls_vocab", "rid_vocab", "desc_vocab")
+
+def load(cache=CACHE):
+    """Cache arrays as a dict, with the STRINGS columns decoded to lists of str."""
+    import numpy as np
+    with np.load(cache) as f:
+        if "image_blob" not in f.files:
+            raise SystemExit(f"{cache} was written by an older rico_cache; rerun `build`")
+        z = {k: f[k] for k in f.files}
+    for name in STRINGS:
+        z[name] = _unpack_strings(z, name)
+    return z
+
+def build(cache=CACHE):
+    import numpy as np
+    from PIL import Image
+    prof = get_profiler("rico_cache.build")
+    names, widths, heights, offsets = [], [], [], [0]
+    cls_v, rid_v, desc_v = _Vocab(), _Vocab(), _Vocab()
+    cls_ids, rid_ids, desc_ids, src, bounds = [], [], [], [], []
+    for img_path in sorted(R.RICO_IMG.glob("*.*")):
+        prof.tick()
+        jpath = R.RICO_JSON/f"{img_path.stem}.json"
+        if not jpath.exists(): continue
+        with prof.stage("parse_json"):
+            txt = jpath.read_text(encoding="utf-8", errors="ignore").strip()
+        with prof.stage("extract_nodes"):
+            nodes = screen_nodes(txt)
+        if not nodes: continue
+        with prof.stage("probe_size"), Image.open(img_path) as im:
+            w,h = im.size
+        for cls, rid, desc, bb, s in nodes:
+            cls_ids.append(cls_v.id(str(cls))); rid_ids.append(rid_v.id(rid)); desc_ids.append(desc_v.id(desc))
+            src.append(s); bounds.append(bb)
+        names.append(img_path.name); widths.append(w); heights.append(h)
+        offsets.append(len(src))
+        prof.count("nodes", len(nodes))
+
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(cache,
+             width=np.array(widths, dtype=np.int32),
+             height=np.array(heights, dtype=np.int32), offsets=np.array(offsets, dtype=np.int64),
+             cls=np.array(cls_ids, dtype=np.int32), rid=np.array(rid_ids, dtype=np.int32),
+             desc=np.array(desc_ids, dtype=np.int32), src=np.array(src, dtype=np.uint8),
+             bounds=np.array(bounds, dtype=np.int32).reshape(-1, 4),
+             **_pack_strings(names, "image"), **_pack_strings(cls_v, "cls_vocab"),
+             **_pack_strings(rid_v, "rid_vocab"), **_pack_strings(desc_v, "desc_vocab"))
+    prof.finish()
+    print(f"Cached {len(src)} view nodes from {len(names)} RICO screens into {cache}")
+
+def _vocab_ids(vocab, fn):
+    import numpy as np
+    # mapping function on each distinct string -> class id (-1 = unmapped)
+    return np.array([R.NAME_TO_ID.get(fn(s), -1) for s in vocab], dtype=np.int16)
+
+def label_ids(z, canon=None, guess=None):
+    """Per-node class id under the given mapping (defaults: rico_to_yolo's), -1 where unmapped."""
+    canon = canon or R.norm_class_name
+    guess = guess or R.guess_from_text
+    cid = _vocab_ids(z["cls_vocab"], canon)[z["cls"]]
+    is_json = z["src"] == SRC_JSON
+    miss = (cid < 0) & is_json
+    if miss.any():
+        cid[miss] = _vocab_ids(z["rid_vocab"], guess)[z["rid"][miss]]
+        miss = (cid < 0) & is_json
+        cid[miss] = _vocab_ids(z["desc_vocab"], guess)[z["desc"][miss]]
+    return cid
+
+def yolo_rows(z, cid):
+    """Vectorized rico_to_yolo.to_yolo over all nodes -> (keep mask, cx, cy, bw, bh)."""
+    import numpy as np
+    counts = np.diff(z["offsets"])
+    w = np.repeat(z["width"], counts).astype(np.int64)
+    h = np.repeat(z["height"], counts).astype(np.int64)
+    b = z["bounds"].astype(np.int64)
+    x1 = np.clip(b[:,0], 0, w-1); y1 = np.clip(b[:,1], 0, h-1)
+    x2 = np.clip(b[:,2], 0, w-1); y2 = np.clip(b[:,3], 0, h-1)
+    cx = (x1+x2)/2/w; cy = (y1+y2)/2/h; bw = (x2-x1)/w; bh = (y2-y1)/h
+    keep = (cid >= 0) & (x2 > x1) & (y2 > y1) & (bw > 0) & (bh > 0) & (bw*bw+bh*bh >= 1e-6)
+    return keep, cx, cy, bw, bh
+
+def relabel(cache=CACHE, out=None, canon=None, guess=None):
+    out = out or R.OUT
+    yolo_dirs(out)
+    prof = get_profiler("rico_cache.relabel")
+    with prof.stage("load"):
+        z = load(cache)
+    with prof.stage("relabel"):
+        cid = label_ids(z, canon, guess)
+        keep, cx, cy, bw, bh = yolo_rows(z, cid)
+    off = z["offsets"].tolist()
+    cid, cx, cy, bw, bh = cid.tolist(), cx.tolist(), cy.tolist(), bw.tolist(), bh.tolist()
+    keep = keep.tolist()
+    kept = dropped = 0
+    with OutputWriter(prof=prof) as writer:
+        for i, name in enumerate(z["image"]):
+            prof.tick()
+            base = Path(name).stem
+            split = R.infer_split_from_name(base)
+            lines = [f"{cid[j]} {cx[j]:.6f} {cy[j]:.6f} {bw[j]:.6f} {bh[j]:.6f}"
+                     for j in range(off[i], off[i+1]) if keep[j]]
+            img_dst = out/f"images/{split}/{name}"
+            lbl_dst = out/f"labels/{split}/{base}.txt"
+            if not lines:
+                # the new mapping leaves nothing on this screen: drop what an older run wrote
+                if lbl_dst.exists():
+                    lbl_dst.unlink(); img_dst.unlink(missing_ok=True); dropped += 1
+                continue
+            with prof.stage("queue_writes"):
+                writer.write_text(lbl_dst, "\n".join(lines))
+                if not img_dst.exists():
+                    writer.copy(R.RICO_IMG/name, img_dst)
+            kept += 1
+    prof.finish()
+    print(f"Relabelled {kept} RICO images into {out} ({dropped} screens no longer labelled)")
+
+def main(argv=None, prog=None):
+    # prog: the subcommand's usage name when a caller supplies the subcommand (`tools pack rico-cache`)
+    ap = argparse.ArgumentParser(description="Parse-once cache for the Rico view hierarchies.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    for cmd, text in (("build", "parse every data_raw/rico screen once into the cache"),
+                      ("relabel", "write data_yolo/ labels from the cache with the current class map")):
+        p = sub.add_parser(cmd, help=text, description=text, prog=prog)
+        p.add_argument("--cache", type=Path, default=CACHE, help="default: data_cache/rico_nodes.npz")
+    a = ap.parse_args(argv)
+    if a.cmd == "build": build(a.cache)
+    else: relabel(a.cache)
+
+if __name__ == "__main__":
+    run(main)
@@ -1,8 +1,13 @@
 # tools/rico_to_yolo.py
 import json, re
 from pathlib import Path
-from PIL import Image
 import xml.etree.ElementTree as ET
+try:
+    from .profiling import get_profiler, run
+    from .writer import OutputWriter, yolo_dirs
+except ImportError:   # run as a script: python tools/rico_to_yolo.py
+    from profiling import get_profiler, run
+    from writer import OutputWriter, yolo_dirs
 
 PROJECT   = Path(__file__).resolve().parents[1]
 RICO_IMG  = PROJECT/"data_raw/rico/screens"
@@ -24,6 +29,10 @@ CAND_BOUNDS_KEYS = ("bounds","rel_bounds","boundsInScreen","boundsInParent",
 CAND_ID_KEYS     = ("resource_id","id","res_id")
 CAND_DESC_KEYS   = ("content_desc","contentDescription","desc","description")
 
+XML_CHUNK = 1 << 16
+# uiautomator dumps: bounds="[x1,y1][x2,y2]"
+XML_BOUNDS_RE = re.compile(r'\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]')
+
 def norm_class_name(s: str) -> str:
     s = (s or "").lower()
     for key, canon in ANDROID_TO_CANON.items():
@@ -174,19 +183,44 @@ def extract_json_boxes(obj, acc):
             if isinstance(v, (dict, list)):
                 extract_json_boxes(v, acc)
 
+def iter_xml_starts(xml_text):
+    # iterparse over an in-memory string: feed it in slices (no StringIO copy) and
+    # detach each finished element from its parent so the tree never builds up
+    parser = ET.XMLPullParser(events=("start","end"))
+    stack = []
+    for i in range(0, len(xml_text), XML_CHUNK):
+        parser.feed(xml_text[i:i+XML_CHUNK])
+        for ev, el in parser.read_events():
+            if ev == "start":
+                stack.append(el)
+                yield el
+            else:
+                stack.pop()
+                if stack: del stack[-1][-1]
+    parser.close()
+
 def extract_xml_boxes(xml_text, acc):
+    n0 = len(acc)
+    canon = {}   # class string -> canonical name, per dump
     try:
-        root = ET.fromstring(xml_text)
+        for el in iter_xml_starts(xml_text):
+            a = el.attrib
+            cls = a.get("class") or a.get("className") or ""
+            cname = canon.get(cls)
+            if cname is None:
+                cname = canon[cls] = norm_class_name(cls)
+            if not cname: continue   # unmappable class: don't bother with bounds
+            b = a.get("bounds")
+            if b is None: continue
+            m = XML_BOUNDS_RE.match(b)
+            bb = tuple(map(int, m.groups())) if m else parse_bounds_any(b)
+            if bb:
+                x1,y1,x2,y2 = bb
+                if x2>x1 and y2>y1:
+                    acc.append((cname,(x1,y1,x2,y2)))
     except Exception:
+        del acc[n0:]   # malformed: same as before, no boxes from this dump
         return
-    for el in root.iter():
-        cls = el.attrib.get("class") or el.attrib.get("className") or ""
-        cname = norm_class_name(cls)
-        bb = parse_bounds_any(el.attrib.get("bounds"))
-        if cname and bb:
-            x1,y1,x2,y2 = bb
-            if x2>x1 and y2>y1:
-                acc.append((cname,(x1,y1,x2,y2)))
 
 def infer_split_from_name(stem: str) -> str:
     s = stem.lower()
@@ -196,53 +230,64 @@ def infer_split_from_name(stem: str) -> str:
     return "train"
 
 def main():
-    for s in ('train','val','test'):
-        (OUT/f"images/{s}").mkdir(parents=True, exist_ok=True)
-        (OUT/f"labels/{s}").mkdir(parents=True, exist_ok=True)
+    from PIL import Image
+    yolo_dirs(OUT)
 
+    prof = get_profiler("rico_to_yolo")
     kept = 0
-    for img_path in sorted(RICO_IMG.glob("*.*")):
-        base = img_path.stem
-        jpath = RICO_JSON/f"{base}.json"
-        if not jpath.exists(): continue
-
-        txt = jpath.read_text(encoding="utf-8", errors="ignore").strip()
-        boxes = []
-
-        # JSON first
-        data = None
-        try:
-            data = json.loads(txt)
-        except Exception:
-            data = None
-
-        if isinstance(data, dict):
-            extract_json_boxes(data, boxes)
-        elif isinstance(data, str):
-            if "<" in data: extract_xml_boxes(data, boxes)
-            else:
-                try: extract_json_boxes(json.loads(data), boxes)
-                except Exception: pass
-        if not boxes and "<" in txt:
-            extract_xml_boxes(txt, boxes)
-        if not boxes: continue
-
-        im = Image.open(img_path).convert("RGB")
-        w,h = im.size
-        lines=[]
-        for cname,(x1,y1,x2,y2) in boxes:
-            cid = NAME_TO_ID.get(cname); 
-            if cid is None: continue
-            yolo = to_yolo(x1,y1,x2,y2,w,h,cid)
-            if yolo: lines.append(yolo)
-        if not lines: continue
-
-        split = infer_split_from_name(base)
-        (OUT/f"images/{split}/{img_path.name}").write_bytes(img_path.read_bytes())
-        (OUT/f"labels/{split}/{base}.txt").write_text("\n".join(lines), encoding="utf-8")
-        kept += 1
+    with OutputWriter(prof=prof) as out:
+        for img_path in sorted(RICO_IMG.glob("*.*")):
+            prof.tick()
+            base = img_path.stem
+            jpath = RICO_JSON/f"{base}.json"
+            if not jpath.exists():
+                prof.count("no_json"); continue
+
+            boxes = []
+            with prof.stage("parse_json"):
+                txt = jpath.read_text(encoding="utf-8", errors="ignore").strip()
+                # JSON first
+                data = None
+                try:
+                    data = json.loads(txt)
+                except Exception:
+                    data = None
+
+            with prof.stage("extract_boxes"):
+                if isinstance(data, dict):
+                    extract_json_boxes(data, boxes)
+                elif isinstance(data, str):
+                    if "<" in data: extract_xml_boxes(data, boxes)
+                    else:
+                        try: extract_json_boxes(json.loads(data), boxes)
+                        except Exception: pass
+                if not boxes and "<" in txt:
+                    extract_xml_boxes(txt, boxes)
+            if not boxes:
+                prof.count("no_boxes"); continue
+            prof.count("boxes", len(boxes))
+
+            with prof.stage("probe_size"):
+                im = Image.open(img_path).convert("RGB")
+                w,h = im.size
+            lines=[]
+            for cname,(x1,y1,x2,y2) in boxes:
+                cid = NAME_TO_ID.get(cname); 
+                if cid is None: continue
+                yolo = to_yolo(x1,y1,x2,y2,w,h,cid)
+                if yolo: lines.append(yolo)
+            if not lines:
+                prof.count("no_lines"); continue
+
+            split = infer_split_from_name(base)
+            with prof.stage("queue_writes"):
+                out.copy(img_path, OUT/f"images/{split}/{img_path.name}")
+                out.write_text(OUT/f"labels/{split}/{base}.txt", "\n".join(lines))
+            kept += 1
+            prof.count("kept")
 
+    prof.finish()
     print(f"Converted {kept} RICO images into data_yolo/")
 
 if __name__ == "__main__":
-    main()
+    run(main)
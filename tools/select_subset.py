@@ -0,0 +1,212 @@
+# tools/select_subset.py
+"""
+Pick a smaller, weighted training list instead of `fraction: 1.0` over every screen.
+
+  python tools/select_subset.py --fraction 0.4                         # score by label statistics
+  python tools/select_subset.py --mode loss --loss-csv losses.csv      # per-image loss from a prior run
+  python tools/select_subset.py --mode pred --pred-dir runs/.../labels # prediction vs label disagreement
+
+Scores (higher = more useful to train on):
+  labels  boxes weighted by inverse class frequency, plus a bonus for small boxes
+  loss    the `loss` column of a CSV with an `image` column (file name or stem)
+  pred    1 - F1 at IoU 0.5 between a prior run's predictions (save_txt/save_conf) and the labels
+
+Screens whose labels are the same layout as one already seen (boxes quantized to 2%) are
+dropped as redundant. The budget is split between the hardest images and a uniform sample
+of the rest. Hard images are repeated by rank, which is how a plain image-list file carries
+weights: the hard set is cut into --max-repeat equal bands, the top band listed --max-repeat
+times down to once for the last. Writes train_subset.txt and a data.yaml pointing `train:`
+at it. Label statistics are cached in data_cache/ by label file hash, prediction scores by
+image + label + prediction hash, so re-runs and other fractions only rescore what changed.
+"""
+import argparse, csv, hashlib, json, os, random
+from pathlib import Path
+
+try:
+    from .yolo_dataset import PROJECT, YoloDataset, read_labels
+    from .profiling import get_profiler, run
+except ImportError:   # run as a script: python tools/select_subset.py
+    from yolo_dataset import PROJECT, YoloDataset, read_labels
+    from profiling import get_profiler, run
+
+DATA_YAML = PROJECT/"Rico-1/data.yaml"
+OUT       = PROJECT/"data_cache/subset"
+CACHE     = PROJECT/"data_cache/subset_scores.json"
+SMALL     = 0.001   # normalized box area counted as "small"
+
+# ---------------- hashing + cache ----------------
+
+class ScoreCache:
+    """{path: [size, mtime_ns, sha1]} for files, {kind: {content key: value}} for scores."""
+    def __init__(self, path=CACHE):
+        self.path = path
+        try:
+            d = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            d = {}
+        self.files = d.get("files", {}); self.scores = d.get("scores", {})
+
+    def sha1(self, p: Path) -> str:
+        try:
+            st = os.stat(p)
+        except FileNotFoundError:
+            return "-"
+        ent = self.files.get(str(p))
+        if ent and ent[0] == st.st_size and ent[1] == st.st_mtime_ns:
+            return ent[2]
+        h = hashlib.sha1()
+        with open(p, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""): h.update(chunk)
+        self.files[str(p)] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+        return h.hexdigest()
+
+    def get(self, kind, key, fn):
+        table = self.scores.setdefault(kind, {})
+        if key not in table: table[key] = fn()
+        return table[key]
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({"files": self.files, "scores": self.scores}), encoding="utf-8")
+
+# ---------------- scoring ----------------
+
+def label_stats(lab, nc):
+    import numpy as np
+    counts = np.bincount(lab[:,0].astype(np.int64), minlength=nc)[:nc] if len(lab) else np.zeros(nc, np.int64)
+    return {"counts": counts.tolist(), "small": int((lab[:,3]*lab[:,4] < SMALL).sum()) if len(lab) else 0}
+
+def layout_key(lab):
+    import numpy as np
+    q = np.round(lab / 0.02).astype(np.int32) if len(lab) else lab
+    return hashlib.sha1(np.ascontiguousarray(q[np.lexsort(q.T[::-1])] if len(q) else q).tobytes()).hexdigest()
+
+def _iou(a, b):
+    # a (n,4) b (m,4) xyxy -> (n,m)
+    import numpy as np
+    ix = np.clip(np.minimum(a[:,None,2], b[None,:,2]) - np.maximum(a[:,None,0], b[None,:,0]), 0, None)
+    iy = np.clip(np.minimum(a[:,None,3], b[None,:,3]) - np.maximum(a[:,None,1], b[None,:,1]), 0, None)
+    inter = ix*iy
+    area = lambda x: (x[:,2]-x[:,0])*(x[:,3]-x[:,1])
+    return inter / np.maximum(area(a)[:,None] + area(b)[None,:] - inter, 1e-12)
+
+def _xyxy(lab):
+    import numpy as np
+    cx, cy, w, h = lab[:,1], lab[:,2], lab[:,3], lab[:,4]
+    return np.stack([cx-w/2, cy-h/2, cx+w/2, cy+h/2], 1)
+
+def disagreement(lab, pred_path: Path, conf=0.25, iou_thr=0.5):
+    """1 - F1 of class-aware greedy matching; 1.0 when the run predicted nothing useful."""
+    import numpy as np
+    try:
+        vals = pred_path.read_text(encoding="utf-8").split()
+    except FileNotFoundError:
+        vals = []
+    pred = np.array(vals, dtype=np.float32).reshape(-1, 6) if vals else np.zeros((0, 6), np.float32)
+    pred = pred[pred[:,5] >= conf]
+    if not len(lab) and not len(pred): return 0.0
+    if not len(lab) or not len(pred): return 1.0
+    pred = pred[np.argsort(-pred[:,5])]
+    ious = _iou(_xyxy(pred), _xyxy(lab))
+    ious[pred[:,0][:,None] != lab[:,0][None,:]] = 0
+    used = np.zeros(len(lab), bool); tp = 0
+    for row in ious:
+        row = np.where(used, 0, row); j = int(row.argmax())
+        if row[j] >= iou_thr: used[j] = True; tp += 1
+    return float(1 - 2*tp / (len(pred) + len(lab)))
+
+def load_losses(csv_path: Path) -> dict:
+    with open(csv_path, newline="", encoding="utf-8") as fh:
+        return {Path(r["image"]).stem: float(r["loss"]) for r in csv.DictReader(fh)}
+
+def label_entry(lab, nc):
+    st = label_stats(lab, nc); st["layout"] = layout_key(lab)
+    return st
+
+def score_split(split, nc, mode, cache, pred_dir=None, losses=None):
+    """Returns (scores array, layout keys) for every image of the split."""
+    import numpy as np
+    prof = get_profiler("select_subset.score")
+    entries, scores = [], []
+    for i in range(len(split)):
+        prof.tick()
+        img, lbl = split[i]
+        # label-derived numbers depend on the label file alone: no image hashing, no re-read on a hit
+        lkey = f"{nc}:{cache.sha1(lbl)}"
+        entries.append(cache.get("label_stats", lkey, lambda: label_entry(read_labels(lbl), nc)))
+        if mode == "pred":
+            # tied to one prior run on these exact images
+            pp = pred_dir/f"{img.stem}.txt"
+            key = f"{cache.sha1(img)}:{lkey}:{cache.sha1(pp)}"
+            scores.append(cache.get("pred", key, lambda: disagreement(read_labels(lbl), pp)))
+        elif mode == "loss":
+            scores.append(losses.get(img.stem, 0.0))
+    prof.finish()
+    layouts = [e["layout"] for e in entries]
+    if mode != "labels":
+        return np.array(scores, dtype=np.float64), layouts
+    counts = np.array([e["counts"] for e in entries], dtype=np.float64).reshape(-1, nc)
+    small = np.array([e["small"] for e in entries], dtype=np.float64)
+    freq = counts.sum(0)
+    w = np.where(freq > 0, freq.sum() / (nc * np.maximum(freq, 1)), 0.0)   # inverse class frequency
+    return counts @ w + 0.5*small, layouts
+
+# ---------------- selection ----------------
+
+def select(scores, layouts, fraction, hard_share=0.5, max_repeat=3, seed=0):
+    """Returns [(index, repeats)] for the chosen images."""
+    import numpy as np
+    seen, cand = set(), []
+    for i in np.argsort(-scores, kind="stable").tolist():
+        if layouts[i] in seen: continue   # same label layout as a higher-scored screen
+        seen.add(layouts[i]); cand.append(i)
+    budget = min(len(cand), max(1, round(fraction * len(scores))))
+    n_hard = int(budget * hard_share)
+    hard, rest = cand[:n_hard], cand[n_hard:]
+    picked = [(i, 1) for i in random.Random(seed).sample(rest, budget - n_hard)]
+    # repeats by rank: the hard set is cut into max_repeat bands, listed max_repeat times .. once
+    for r, i in enumerate(hard):
+        picked.append((i, max_repeat - r * max_repeat // len(hard)))
+    return sorted(picked)
+
+def main(argv=None, prog=None):
+    import yaml
+    ap = argparse.ArgumentParser(prog=prog, description="Active-sampling training subset selector.")
+    ap.add_argument("--data", type=Path, default=DATA_YAML)
+    ap.add_argument("--split", default="train")
+    ap.add_argument("--mode", choices=("labels", "loss", "pred"), default="labels")
+    ap.add_argument("--loss-csv", type=Path, help="mode=loss: CSV with image,loss columns")
+    ap.add_argument("--pred-dir", type=Path, help="mode=pred: YOLO txt predictions with confidences")
+    ap.add_argument("--fraction", type=float, default=0.5, help="distinct images to keep, as a share of the split")
+    ap.add_argument("--hard-share", type=float, default=0.5, help="share of the budget taken by top scores")
+    ap.add_argument("--max-repeat", type=int, default=3)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", type=Path, default=OUT)
+    a = ap.parse_args(argv)
+    if a.mode == "loss" and not a.loss_csv: ap.error("--mode loss needs --loss-csv")
+    if a.mode == "pred" and not a.pred_dir: ap.error("--mode pred needs --pred-dir")
+
+    ds = YoloDataset(a.data)
+    split = ds[a.split]
+    if not len(split):
+        raise SystemExit(f"No images in {split.img_dir}; nothing to select from")
+    cache = ScoreCache()
+    scores, layouts = score_split(split, ds.nc, a.mode, cache, a.pred_dir,
+                                  load_losses(a.loss_csv) if a.loss_csv else None)
+    cache.save()
+    picked = select(scores, layouts, a.fraction, a.hard_share, a.max_repeat, a.seed)
+
+    a.out.mkdir(parents=True, exist_ok=True)
+    lst = a.out/f"{a.split}_subset.txt"
+    lst.write_text("".join(f"{split[i][0]}\n" * rep for i, rep in picked), encoding="utf-8")
+    cfg = {"path": str(ds.root), "names": ds.names, "nc": ds.nc, "train": str(lst)}
+    for s in ("val", "test"):
+        if s in ds: cfg[s] = str(ds[s].img_dir)
+    (a.out/"data.yaml").write_text(yaml.safe_dump(cfg, sort_keys=False), encoding="utf-8")
+    n_rows = sum(rep for _, rep in picked)
+    print(f"Selected {len(picked)}/{len(split)} images ({n_rows} list rows, {n_rows/len(split):.0%} of an epoch) "
+          f"-> {lst}")
+    print(f"Train with data={a.out/'data.yaml'}")
+
+if __name__ == "__main__":
+    run(main)
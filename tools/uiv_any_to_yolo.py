@@ -1,15 +1,21 @@
 import json, random
 from pathlib import Path
-from PIL import Image
+try:
+    from .profiling import get_profiler, run
+    from .writer import OutputWriter, yolo_dirs
+    from .yolo_dataset import split_counts
+    from .uiv_schema import iter_leaves, jsonl_leaves, load_plans, plan_for, plan_reader, save_plans
+except ImportError:   # run as a script: python tools/uiv_any_to_yolo.py
+    from profiling import get_profiler, run
+    from writer import OutputWriter, yolo_dirs
+    from yolo_dataset import split_counts
+    from uiv_schema import iter_leaves, jsonl_leaves, load_plans, plan_for, plan_reader, save_plans
 
 UIV = Path("data_raw/ui_vision")
-ANN_FILES = list(UIV.glob("annotations/**/*.json")) + list(UIV.glob("annotations/**/*.jsonl"))
+ANN_FILES = None   # None: globbed under UIV/annotations when main() runs
 IMG_ROOT = UIV / "images"
 
-YOLO = Path("data_yolo")
-for s in ("train","val","test"):
-    (YOLO/f"images/{s}").mkdir(parents=True, exist_ok=True)
-    (YOLO/f"labels/{s}").mkdir(parents=True, exist_ok=True)
+YOLO = Path("data_yolo")   # created by main(), not at import
 
 NAMES = ['button','field','heading','image','label','link','text']
 NAME_TO_ID = {n:i for i,n in enumerate(NAMES)}
@@ -58,16 +64,15 @@ def parse_bbox(obj):
 
 def to_records(any_json, file_hint=""):
     """
-    Normalize MANY schema variants to [{image: <basename>, objects: [{label, bbox}, ...]}].
+    Normalize MANY schema variants to a stream of {image: <basename>, objects: [{label, bbox}, ...]}.
     """
-    recs=[]
     if isinstance(any_json, dict):
         # possible keys containing list of records
         for k in ("records","data","items","annotations","images","entries"):
             if k in any_json and isinstance(any_json[k], list):
                 for it in any_json[k]:
-                    recs += to_records(it, file_hint)
-                return recs
+                    yield from to_records(it, file_hint)
+                return
         # dict as one record?
         img = any_json.get("image") or any_json.get("image_name") or any_json.get("image_path") or any_json.get("file_name") or any_json.get("path") or any_json.get("screenshot")
         if not img and "meta" in any_json and isinstance(any_json["meta"], dict):
@@ -80,13 +85,34 @@ def to_records(any_json, file_hint=""):
                 p = parse_bbox(o)
                 if p: std.append({"label": p[0], "bbox": p[1]})
             if std:
-                recs.append({"image": Path(str(img)).name, "objects": std})
-        return recs
+                yield {"image": Path(str(img)).name, "objects": std}
+        return
     if isinstance(any_json, list):
         for it in any_json:
-            recs += to_records(it, file_hint)
-        return recs
-    return recs
+            yield from to_records(it, file_hint)
+
+def merge_records(recs, img_index, index, limit=None):
+    """
+    Fold records into `index` (image basename -> {image: Path, objects, keys}): records for
+    the same image are merged, repeated (label, bbox) objects dropped, and records whose
+    image isn't on disk skipped. Returns False once `limit` images are indexed.
+    """
+    for r in recs:
+        name = r["image"].lower()
+        ent = index.get(name)
+        if ent is None:
+            p = img_index.get(name)
+            if p is None: continue
+            if limit and len(index) >= limit: return False
+            ent = index[name] = {"image": p, "objects": [], "keys": set()}
+        for o in r["objects"]:
+            key = (o["label"], tuple(o["bbox"]))
+            try:
+                if key in ent["keys"]: continue
+            except TypeError:   # list/dict label or coordinate: unusable object, not a bad file
+                continue
+            ent["keys"].add(key); ent["objects"].append(o)
+    return True
 
 def scan_images(root: Path):
     idx={}
@@ -95,75 +121,98 @@ def scan_images(root: Path):
             idx[p.name.lower()] = p
     return idx
 
+def find_ann_files(uiv: Path):
+    return list(uiv.glob("annotations/**/*.json")) + list(uiv.glob("annotations/**/*.jsonl"))
+
 def main(max_files=None, seed=0):
+    from PIL import Image
     random.seed(seed)
-    if not ANN_FILES:
+    ann_files = ANN_FILES if ANN_FILES is not None else find_ann_files(UIV)
+    if not ann_files:
         print("No annotation files found under", (UIV/"annotations").resolve())
         return
-    img_index = scan_images(IMG_ROOT)
+    prof = get_profiler("uiv_any_to_yolo")
+    with prof.stage("index_images"):
+        img_index = scan_images(IMG_ROOT)
     if not img_index:
         print("No images found under", IMG_ROOT)
         return
 
-    all_recs=[]
-    for f in ANN_FILES:
+    # one pass: every record is merged into a per-image index as soon as it's parsed;
+    # max_files caps the number of images, across all annotation files
+    # each file is read through a per-file key plan (see uiv_schema.py), cached by fingerprint
+    index = {}
+    plans = load_plans()
+    room = True
+    for f in ann_files:
+        if not room: break
         try:
             if f.suffix==".jsonl":
-                for i, line in enumerate(f.read_text(encoding="utf-8", errors="ignore").splitlines()):
-                    if not line.strip(): continue
-                    obj = json.loads(line)
-                    all_recs += to_records(obj, f.name)
-                    if max_files and i>max_files: break
+                with prof.stage("infer_schema"):
+                    plan = plan_for(f, lambda: jsonl_leaves(f), plans)
+                    records = plan_reader(plan, to_records, parse_bbox)
+                with open(f, encoding="utf-8", errors="ignore") as fh:
+                    for line in fh:
+                        if not line.strip(): continue
+                        with prof.stage("parse_json"):
+                            obj = json.loads(line)
+                        with prof.stage("index_records"):
+                            room = merge_records(records(obj), img_index, index, max_files)
+                        if not room: break
             else:
-                obj = json.loads(f.read_text(encoding="utf-8", errors="ignore"))
-                all_recs += to_records(obj, f.name)
+                with prof.stage("parse_json"):
+                    obj = json.loads(f.read_text(encoding="utf-8", errors="ignore"))
+                with prof.stage("infer_schema"):
+                    plan = plan_for(f, lambda: iter_leaves(obj), plans)
+                with prof.stage("index_records"):
+                    room = merge_records(plan_reader(plan, to_records, parse_bbox)(obj), img_index, index, max_files)
+            prof.count("planned_files" if plan else "generic_files")
         except Exception as e:
+            prof.count("bad_files")
             continue
-
-    # keep only recs that we can map to an actual image
-    recs = []
-    seen = set()
-    for r in all_recs:
-        name = r["image"].lower()
-        if name in img_index and (name, id(r)) not in seen and r["objects"]:
-            recs.append({"image": img_index[name], "objects": r["objects"]})
-            seen.add((name, id(r)))
+    save_plans(plans)
+    recs = list(index.values())
 
     if not recs:
         print("Parsed 0 usable records. Likely the JSON schema uses different keys for image or boxes.")
         print("Run:  python tools/uiv_debug.py  and share the keys it prints.")
         return
 
-    if max_files: recs = recs[:max_files]
     random.shuffle(recs)
     n=len(recs); i_tr=int(0.8*n); i_va=int(0.9*n)
     splits=[("train",recs[:i_tr]),("val",recs[i_tr:i_va]),("test",recs[i_va:])]
 
     used=0
-    for split, items in splits:
-        for r in items:
-            img_p = r["image"]
-            with Image.open(img_p) as im:
-                W,H = im.size
-            lines=[]
-            for o in r["objects"]:
-                cname = canonical_label(o.get("label",""))
-                if not cname: 
-                    continue
-                cid = NAME_TO_ID[cname]
-                x1,y1,x2,y2 = o["bbox"]
-                line = xyxy_to_yolo(x1,y1,x2,y2,W,H,cid)
-                if line: lines.append(line)
-            if not lines: 
-                continue
-            (YOLO/f"images/{split}/{img_p.name}").write_bytes(img_p.read_bytes())
-            (YOLO/f"labels/{split}/{img_p.stem}.txt").write_text("\n".join(lines), encoding="utf-8")
-            used+=1
-
-    counts = {s: len(list((YOLO/f"images/{s}").glob("*.*"))) for s in ("train","val","test")}
+    yolo_dirs(YOLO)
+    with OutputWriter(prof=prof) as out:
+        for split, items in splits:
+            for r in items:
+                prof.tick()
+                img_p = r["image"]
+                with prof.stage("probe_size"), Image.open(img_p) as im:
+                    W,H = im.size
+                lines=[]
+                for o in r["objects"]:
+                    cname = canonical_label(o.get("label",""))
+                    if not cname: 
+                        continue
+                    cid = NAME_TO_ID[cname]
+                    x1,y1,x2,y2 = o["bbox"]
+                    line = xyxy_to_yolo(x1,y1,x2,y2,W,H,cid)
+                    if line: lines.append(line)
+                if not lines: 
+                    prof.count("no_lines"); continue
+                with prof.stage("queue_writes"):
+                    out.copy(img_p, YOLO/f"images/{split}/{img_p.name}")
+                    out.write_text(YOLO/f"labels/{split}/{img_p.stem}.txt", "\n".join(lines))
+                used+=1
+                prof.count("used")
+
+    prof.finish()
+    counts = split_counts(YOLO)
     print(f"Converted {used} UI-Vision images into data_yolo/")
     print("Splits ->", counts)
 
 if __name__ == "__main__":
     # start small; set to None for full run
-    main(max_files=None)
+    run(main, max_files=None)
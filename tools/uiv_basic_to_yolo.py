@@ -1,16 +1,20 @@
 import json, random, collections
 from pathlib import Path
-from PIL import Image
+try:
+    from .profiling import get_profiler, run
+    from .writer import OutputWriter, yolo_dirs
+    from .yolo_dataset import split_counts
+except ImportError:   # run as a script: python tools/uiv_basic_to_yolo.py
+    from profiling import get_profiler, run
+    from writer import OutputWriter, yolo_dirs
+    from yolo_dataset import split_counts
 
 # ---- paths ----
 UIV = Path("data_raw/ui_vision")
 ANN = UIV / "annotations" / "element_grounding" / "element_grounding_basic.json"  # change to functional/spatial later if you want
 IMG_ROOT = UIV / "images"  # we will find images recursively under here
 
-YOLO = Path("data_yolo")
-for s in ("train","val","test"):
-    (YOLO/f"images/{s}").mkdir(parents=True, exist_ok=True)
-    (YOLO/f"labels/{s}").mkdir(parents=True, exist_ok=True)
+YOLO = Path("data_yolo")   # created by main(), not at import
 
 # ---- your 7 classes ----
 NAMES = ['button','field','heading','image','label','link','text']
@@ -74,26 +78,8 @@ def xyxy_to_yolo(x1,y1,x2,y2,W,H,cid):
     cx=(x1+x2)/2/W; cy=(y1+y2)/2/H; w=(x2-x1)/W; h=(y2-y1)/H
     return f"{cid} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}"
 
-def main(max_images=None, seed=0):
-    random.seed(seed)
-
-    if not ANN.exists():
-        print("Annotation file not found:", ANN)
-        return
-
-    # 1) index all images by basename
-    img_index = build_image_index(IMG_ROOT)
-    if not img_index:
-        print("No images found under", IMG_ROOT.resolve())
-        return
-
-    # 2) read the basic JSON (list of rows)
-    data = json.loads(ANN.read_text(encoding="utf-8", errors="ignore"))
-    if not isinstance(data, list):
-        print("Unexpected JSON type. Expected a list of rows.")
-        return
-
-    # 3) group rows by image basename
+def group_rows(data, img_index):
+    """Rows -> ({image basename: [{"label", "bbox"}]}, unknown label Counter, rows with missing images)."""
     grouped = collections.defaultdict(list)
     unknown_labels = collections.Counter()
     missing_imgs = 0
@@ -117,6 +103,34 @@ def main(max_images=None, seed=0):
             continue
 
         grouped[base].append({"label": cname, "bbox": bbox})
+    return grouped, unknown_labels, missing_imgs
+
+def main(max_images=None, seed=0):
+    from PIL import Image
+    random.seed(seed)
+    prof = get_profiler("uiv_basic_to_yolo")
+
+    if not ANN.exists():
+        print("Annotation file not found:", ANN)
+        return
+
+    # 1) index all images by basename
+    with prof.stage("index_images"):
+        img_index = build_image_index(IMG_ROOT)
+    if not img_index:
+        print("No images found under", IMG_ROOT.resolve())
+        return
+
+    # 2) read the basic JSON (list of rows)
+    with prof.stage("parse_json"):
+        data = json.loads(ANN.read_text(encoding="utf-8", errors="ignore"))
+    if not isinstance(data, list):
+        print("Unexpected JSON type. Expected a list of rows.")
+        return
+
+    # 3) group rows by image basename
+    with prof.stage("group_rows"):
+        grouped, unknown_labels, missing_imgs = group_rows(data, img_index)
 
     if not grouped:
         print("No usable annotations. (All labels unmapped or images missing?)")
@@ -136,26 +150,33 @@ def main(max_images=None, seed=0):
     }
 
     used=0
-    for split, names in split_keys.items():
-        for name in names:
-            img_p = img_index[name]
-            with Image.open(img_p) as im:
-                W,H = im.size
-            ylines=[]
-            for o in grouped[name]:
-                cid = NAME_TO_ID[o["label"]]
-                xyxy = to_xyxy(o["bbox"], W, H)
-                if not xyxy: 
-                    continue
-                line = xyxy_to_yolo(*xyxy, W,H,cid)
-                if line: ylines.append(line)
-            if not ylines:
-                continue
-            (YOLO/f"images/{split}/{img_p.name}").write_bytes(img_p.read_bytes())
-            (YOLO/f"labels/{split}/{img_p.stem}.txt").write_text("\n".join(ylines), encoding="utf-8")
-            used += 1
-
-    counts = {s: len(list((YOLO/f"images/{s}").glob("*.*"))) for s in ("train","val","test")}
+    yolo_dirs(YOLO)
+    with OutputWriter(prof=prof) as out:
+        for split, names in split_keys.items():
+            for name in names:
+                prof.tick()
+                img_p = img_index[name]
+                with prof.stage("probe_size"), Image.open(img_p) as im:
+                    W,H = im.size
+                ylines=[]
+                for o in grouped[name]:
+                    cid = NAME_TO_ID[o["label"]]
+                    xyxy = to_xyxy(o["bbox"], W, H)
+                    if not xyxy: 
+                        continue
+                    line = xyxy_to_yolo(*xyxy, W,H,cid)
+                    if line: ylines.append(line)
+                if not ylines:
+                    prof.count("no_lines"); continue
+                with prof.stage("queue_writes"):
+                    out.copy(img_p, YOLO/f"images/{split}/{img_p.name}")
+                    out.write_text(YOLO/f"labels/{split}/{img_p.stem}.txt", "\n".join(ylines))
+                used += 1
+                prof.count("used")
+
+    prof.finish()
+
+    counts = split_counts(YOLO)
     print(f"Converted {used} UI-Vision images into data_yolo/")
     print("New split counts:", counts)
     if unknown_labels:
@@ -165,4 +186,4 @@ def main(max_images=None, seed=0):
 
 if __name__ == "__main__":
     # Start small: remove max_images to process all
-    main(max_images=None)
+    run(main, max_images=None)
@@ -1,29 +1,47 @@
 from pathlib import Path
 import json, itertools
+try:
+    from .uiv_schema import infer_plan, iter_leaves, jsonl_leaves, SAMPLE
+except ImportError:   # run as a script: python tools/uiv_debug.py
+    from uiv_schema import infer_plan, iter_leaves, jsonl_leaves, SAMPLE
 
-root = Path("data_raw/ui_vision")
-ann_files = list(root.glob("annotations/**/*.json")) + list(root.glob("annotations/**/*.jsonl"))
-img_files = list(root.glob("images/**/*.*"))
+ROOT = Path("data_raw/ui_vision")
 
-print(f"Found {len(img_files)} images, {len(ann_files)} annotation files")
-for p in ann_files[:10]:
-    print("ANN:", p)
+def main(root=ROOT):
+    root = Path(root)
+    ann_files = list(root.glob("annotations/**/*.json")) + list(root.glob("annotations/**/*.jsonl"))
+    img_files = list(root.glob("images/**/*.*"))
 
-# peek first JSON file
-for p in ann_files:
-    try:
-        if p.suffix == ".jsonl":
-            line = p.read_text(encoding="utf-8", errors="ignore").splitlines()[0]
-            obj = json.loads(line)
-        else:
-            obj = json.loads(p.read_text(encoding="utf-8", errors="ignore"))
-        print("\nSample from:", p)
-        if isinstance(obj, dict):
-            print("dict keys:", list(itertools.islice(obj.keys(), 20)))
-        elif isinstance(obj, list) and obj:
-            print("list[0] keys:", list(obj[0].keys()))
-        else:
-            print("type:", type(obj))
-        break
-    except Exception as e:
-        continue
+    print(f"Found {len(img_files)} images, {len(ann_files)} annotation files")
+    for p in ann_files[:10]:
+        print("ANN:", p)
+
+    # peek first JSON file
+    for p in ann_files:
+        try:
+            if p.suffix == ".jsonl":
+                line = p.read_text(encoding="utf-8", errors="ignore").splitlines()[0]
+                obj = json.loads(line)
+            else:
+                obj = json.loads(p.read_text(encoding="utf-8", errors="ignore"))
+            print("\nSample from:", p)
+            if isinstance(obj, dict):
+                print("dict keys:", list(itertools.islice(obj.keys(), 20)))
+            elif isinstance(obj, list) and obj:
+                print("list[0] keys:", list(obj[0].keys()))
+            else:
+                print("type:", type(obj))
+            break
+        except Exception as e:
+            continue
+
+    # the key plan uiv_any_to_yolo will read each file with (None = mixed layout, generic path)
+    for p in ann_files:
+        try:
+            leaves = jsonl_leaves(p) if p.suffix == ".jsonl" else iter_leaves(json.loads(p.read_text(encoding="utf-8", errors="ignore")))
+            print("PLAN:", p.name, infer_plan(itertools.islice(leaves, SAMPLE)))
+        except Exception as e:
+            print("PLAN:", p.name, "unreadable:", e)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# tools/uiv_schema.py
+"""
+Per-file schema inference for UI-Vision annotations.
+
+uiv_any_to_yolo.to_records / parse_bbox probe a dozen alternative key names on every
+record and object. A given annotation file almost always uses one layout throughout,
+so we sample its first records once, pick the concrete keys (image key, objects key,
+label key, box form) and read every record through that plan. Whenever a record or
+object doesn't fit the plan, or the generic probing could pick a different key, it
+goes through the generic functions instead, so the output is the same either way.
+plan_reader() compiles a plan into a records() function once per file; a JSONL file
+calls it on every line.
+
+Plans are cached in data_cache/uiv_schemas.json, keyed by file path and fingerprint
+(size, mtime, hash of the first 64K); `None` is cached too, meaning "no single layout,
+use the generic path".
+"""
+import hashlib, itertools, json, os
+from pathlib import Path
+
+CACHE  = Path("data_cache/uiv_schemas.json")
+SAMPLE = 64
+
+# candidate keys, in the order uiv_any_to_yolo.to_records / parse_bbox try them
+LIST_KEYS  = ("records","data","items","annotations","images","entries")
+IMAGE_KEYS = ("image","image_name","image_path","file_name","path","screenshot")
+META_KEYS  = ("image","file_name","path")
+OBJS_KEYS  = ("objects","elements","regions","bboxes","boxes","labels","annotations")
+LABEL_KEYS = ("label","class","category","name","type")
+
+def iter_leaves(any_json):
+    """Record dicts, found by walking containers exactly like to_records does."""
+    if isinstance(any_json, dict):
+        for k in LIST_KEYS:
+            if k in any_json and isinstance(any_json[k], list):
+                for it in any_json[k]:
+                    yield from iter_leaves(it)
+                return
+        yield any_json
+    elif isinstance(any_json, list):
+        for it in any_json:
+            yield from iter_leaves(it)
+
+def jsonl_leaves(path: Path, n_lines=SAMPLE):
+    with open(path, encoding="utf-8", errors="ignore") as fh:
+        for line in itertools.islice((l for l in fh if l.strip()), n_lines):
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                continue   # a broken line mustn't cost the file its good records; main() reads up to it
+            yield from iter_leaves(obj)
+
+def _first_truthy(d, keys):
+    for k in keys:
+        if d.get(k): return k
+    return None
+
+def _box_form(o):
+    # same precedence as parse_bbox
+    b = o.get("bbox")
+    if isinstance(b, (list,tuple)) and len(b)>=4: return ["bbox"]
+    if "x" in o and "y" in o:
+        wk = "w" if "w" in o else "width" if "width" in o else None
+        hk = "h" if "h" in o else "height" if "height" in o else None
+        if wk and hk: return ["xywh", wk, hk]
+    if all(k in o for k in ("x1","y1","x2","y2")): return ["x1y1x2y2"]
+    c = o.get("coords")
+    if isinstance(c, (list,tuple)) and len(c)>=4: return ["coords"]
+    return None
+
+def infer_plan(samples):
+    """One layout shared by every sampled record -> plan dict, else None."""
+    img_k, objs_k, lbl_k, forms = set(), set(), set(), set()
+    n = 0
+    for d in samples:
+        n += 1
+        ik = _first_truthy(d, IMAGE_KEYS)
+        if ik is None:
+            m = d.get("meta")
+            mk = _first_truthy(m, META_KEYS) if isinstance(m, dict) else None
+            if mk is None: return None
+            ik = "meta." + mk
+        ok = _first_truthy(d, OBJS_KEYS)
+        if ok is None or not isinstance(d[ok], list): return None
+        img_k.add(ik); objs_k.add(ok)
+        for o in d[ok][:SAMPLE]:
+            if not isinstance(o, dict): return None
+            lbl_k.add(_first_truthy(o, LABEL_KEYS))
+            f = _box_form(o)
+            forms.add(tuple(f) if f else None)
+    if not n or None in lbl_k or None in forms: return None
+    if len(img_k) != 1 or len(objs_k) != 1 or len(lbl_k) != 1 or len(forms) != 1: return None
+    return {"image": img_k.pop(), "objects": objs_k.pop(), "label": lbl_k.pop(), "box": list(forms.pop())}
+
+def fingerprint(path: Path) -> str:
+    st = os.stat(path)
+    with open(path, "rb") as fh:
+        head = hashlib.sha1(fh.read(1 << 16)).hexdigest()[:16]
+    return f"{st.st_size}:{st.st_mtime_ns}:{head}"
+
+def load_plans(path=CACHE) -> dict:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def save_plans(plans: dict, path=CACHE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(plans, indent=1), encoding="utf-8")
+
+def plan_for(path: Path, samples, plans: dict):
+    """Cached plan for an annotation file; `samples()` yields record dicts to infer from on a miss."""
+    key = str(Path(path).resolve()); fp = fingerprint(path)
+    ent = plans.get(key)
+    if ent and ent.get("fingerprint") == fp:
+        return ent["plan"]
+    plan = infer_plan(itertools.islice(samples(), SAMPLE))
+    plans[key] = {"fingerprint": fp, "plan": plan}
+    return plan
+
+def _earlier(keys, k):
+    # keys the generic `a.get(k0) or a.get(k1) or ...` chain would try before k; if any of
+    # them is present we let the generic code decide (isdisjoint is a cheap C-level check)
+    return keys[:keys.index(k)]
+
+def _image_name(img, posix=os.sep == "/"):
+    # Path(str(img)).name, without building a Path for the usual "dir/file.png" string
+    if posix and type(img) is str:
+        n = img.rpartition("/")[2]
+        if n and n != ".": return n
+    return Path(str(img)).name
+
+def _box_reader(plan):
+    lk, (form, *rest) = plan["label"], plan["box"]
+    before = _earlier(LABEL_KEYS, lk)
+    # each returns {label, bbox: [x1,y1,x2,y2]} exactly as parse_bbox would give, or None = ask parse_bbox
+    if form == "bbox":
+        def read(o):
+            b = o.get("bbox"); lbl = o.get(lk)
+            if not lbl or not isinstance(b, (list,tuple)) or len(b)<4: return None
+            if before and not o.keys().isdisjoint(before): return None
+            if b[2]>b[0] and b[3]>b[1]: return {"label": lbl, "bbox": [b[0],b[1],b[2],b[3]]}
+            return {"label": lbl, "bbox": [b[0],b[1],b[0]+b[2],b[1]+b[3]]}
+    elif form == "xywh":
+        wk, hk = rest
+        # parse_bbox prefers w/h over width/height, and any bbox over both
+        veto = ("bbox",) + before + tuple(alt for k, alt in ((wk, "w"), (hk, "h")) if k != alt)
+        def read(o):
+            lbl = o.get(lk)
+            if not lbl or not o.keys().isdisjoint(veto): return None
+            try: x, y = o["x"], o["y"]; return {"label": lbl, "bbox": [x, y, x+o[wk], y+o[hk]]}
+            except KeyError: return None
+    elif form == "x1y1x2y2":
+        veto = ("bbox", "x") + before
+        def read(o):
+            lbl = o.get(lk)
+            if not lbl or not o.keys().isdisjoint(veto): return None
+            try: return {"label": lbl, "bbox": [o["x1"],o["y1"],o["x2"],o["y2"]]}
+            except KeyError: return None
+    else:
+        veto = ("bbox", "x", "x1") + before
+        def read(o):
+            c = o.get("coords"); lbl = o.get(lk)
+            if not lbl or not isinstance(c, (list,tuple)) or len(c)<4 or not o.keys().isdisjoint(veto): return None
+            return {"label": lbl, "bbox": [c[0],c[1],c[2],c[3]]}
+    return read
+
+def plan_reader(plan, to_records, parse_bbox):
+    """Compile `plan` once per file -> records(any_json), a list of what to_records(any_json) yields."""
+    if plan is None:
+        return to_records
+    ik, ok = plan["image"], plan["objects"]
+    meta = ik[5:] if ik.startswith("meta.") else None
+    img_before = _earlier(META_KEYS, meta) if meta else _earlier(IMAGE_KEYS, ik)
+    objs_before = _earlier(OBJS_KEYS, ok)
+    read = _box_reader(plan)
+    def records(any_json):
+        # a JSONL line is usually the record itself: skip the container walk for it
+        plain = type(any_json) is dict and any_json.keys().isdisjoint(LIST_KEYS)
+        out = []
+        for d in (any_json,) if plain else iter_leaves(any_json):
+            if meta:
+                m = d.get("meta")
+                img = m.get(meta) if isinstance(m, dict) else None
+                # generic only looks at meta when no top-level image key is set
+                clash = bool(img) and not (d.keys().isdisjoint(IMAGE_KEYS) and m.keys().isdisjoint(img_before))
+            else:
+                img = d.get(ik)
+                clash = bool(img_before) and not d.keys().isdisjoint(img_before)
+            objs = d.get(ok)
+            if not img or clash or not objs or not isinstance(objs, list) or (objs_before and not d.keys().isdisjoint(objs_before)):
+                out.extend(to_records(d))
+                continue
+            std = []
+            for o in objs:
+                r = read(o)
+                if r is None:
+                    p = parse_bbox(o)
+                    if not p: continue
+                    r = {"label": p[0], "bbox": p[1]}
+                std.append(r)
+            if std:
+                out.append({"image": _image_name(img), "objects": std})
+        return out
+    return records
+
+def planned_records(any_json, plan, to_records, parse_bbox):
+    """to_records(any_json) through `plan`; for many calls on one file, use plan_reader once."""
+    return plan_reader(plan, to_records, parse_bbox)(any_json)
@@ -1,16 +1,20 @@
 import json, random
 from pathlib import Path
-from PIL import Image
+try:
+    from .profiling import get_profiler, run
+    from .writer import OutputWriter, yolo_dirs
+    from .yolo_dataset import split_counts
+except ImportError:   # run as a script: python tools/uivision_to_yolo.py
+    from profiling import get_profiler, run
+    from writer import OutputWriter, yolo_dirs
+    from yolo_dataset import split_counts
 
 # -------- paths --------
 UIV = Path("data_raw/ui_vision")
 ANN = UIV / "annotations" / "element_grounding" / "element_grounding_basic.json"  # change to functional/spatial if you want
 IMG_ROOT = UIV / "images"  # we'll scan recursively
 
-YOLO = Path("data_yolo")
-for s in ("train","val","test"):
-    (YOLO/f"images/{s}").mkdir(parents=True, exist_ok=True)
-    (YOLO/f"labels/{s}").mkdir(parents=True, exist_ok=True)
+YOLO = Path("data_yolo")   # created by main(), not at import
 
 # -------- class map (7 classes) --------
 NAMES = ['button','field','heading','image','label','link','text']
@@ -104,16 +108,20 @@ def build_image_index(root: Path):
     return idx
 
 def main(max_images=None, seed=0):
+    from PIL import Image
     random.seed(seed)
+    prof = get_profiler("uivision_to_yolo")
 
     # 1) image index
-    img_index = build_image_index(IMG_ROOT)
+    with prof.stage("index_images"):
+        img_index = build_image_index(IMG_ROOT)
     if not img_index:
         print("No images found under", IMG_ROOT)
         return
 
     # 2) load annotations
-    recs = load_records(ANN)
+    with prof.stage("parse_annotations"):
+        recs = load_records(ANN)
     # keep only those we can resolve to a file
     recs = [r for r in recs if r["image"] in img_index]
     if max_images:
@@ -125,31 +133,37 @@ def main(max_images=None, seed=0):
     splits = [("train", recs[:i_tr]), ("val", recs[i_tr:i_va]), ("test", recs[i_va:])]
 
     used = 0
-    for split, items in splits:
-        for r in items:
-            img_path = img_index[r["image"]]
-            with Image.open(img_path) as im:
-                W,H = im.size
-            lines=[]
-            for o in r["objects"]:
-                cname = canonical_label(o["label"])
-                if not cname: 
-                    continue
-                cid = NAME_TO_ID[cname]
-                x1,y1,x2,y2 = o["bbox"]
-                line = xyxy_to_yolo(x1,y1,x2,y2,W,H,cid)
-                if line: lines.append(line)
-            if not lines:
-                continue
-            # write
-            (YOLO/f"images/{split}/{img_path.name}").write_bytes(img_path.read_bytes())
-            (YOLO/f"labels/{split}/{img_path.stem}.txt").write_text("\n".join(lines), encoding="utf-8")
-            used += 1
-
-    counts = {s: len(list((YOLO/f"images/{s}").glob("*.*"))) for s in ("train","val","test")}
+    yolo_dirs(YOLO)
+    with OutputWriter(prof=prof) as out:
+        for split, items in splits:
+            for r in items:
+                prof.tick()
+                img_path = img_index[r["image"]]
+                with prof.stage("probe_size"), Image.open(img_path) as im:
+                    W,H = im.size
+                lines=[]
+                for o in r["objects"]:
+                    cname = canonical_label(o["label"])
+                    if not cname: 
+                        continue
+                    cid = NAME_TO_ID[cname]
+                    x1,y1,x2,y2 = o["bbox"]
+                    line = xyxy_to_yolo(x1,y1,x2,y2,W,H,cid)
+                    if line: lines.append(line)
+                if not lines:
+                    prof.count("no_lines"); continue
+                # write
+                with prof.stage("queue_writes"):
+                    out.copy(img_path, YOLO/f"images/{split}/{img_path.name}")
+                    out.write_text(YOLO/f"labels/{split}/{img_path.stem}.txt", "\n".join(lines))
+                used += 1
+                prof.count("used")
+
+    prof.finish()
+    counts = split_counts(YOLO)
     print(f"Converted {used} UI-Vision images into data_yolo/")
     print("Splits ->", counts)
 
 if __name__ == "__main__":
     # start small to test; set to None to use all available
-    main(max_images=500)
+    run(main, max_images=500)
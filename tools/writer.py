@@ -0,0 +1,124 @@
+# tools/writer.py
+"""
+Background writer for converter output (label .txt files, copied images).
+
+    with OutputWriter() as out:
+        for ...:
+            out.copy(img_path, OUT/f"images/{split}/{img_path.name}")
+            out.write_text(OUT/f"labels/{split}/{base}.txt", "\\n".join(lines))
+
+Writes run on a small thread pool so parsing doesn't wait on the filesystem; at most
+`max_pending` jobs are queued, after which the caller blocks (bounded memory). Every
+file goes to a temp name in the destination dir and is os.replace()d into place, so a
+crash or Ctrl-C never leaves a half-written label or image behind. Leaving the `with`
+block - normally, on an exception or on KeyboardInterrupt - drains the queue first.
+A failed write is re-raised on the next call or on exit. Two jobs for the same
+destination never run at once: a call waits for the still-queued job on its path, so the
+last call wins, as with plain sequential writes.
+
+Pass the converter's profiler (`OutputWriter(prof=prof)`) to time the writes themselves
+in the workers, as the write_labels (write_text/write_bytes) and copy_image (copy) stages;
+the caller's own stage around the calls only sees queueing and backpressure.
+"""
+import os, shutil, threading, time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+
+def _tmp_name(dst: Path) -> Path:
+    # unique per process + thread, hidden, same directory (os.replace must not cross filesystems)
+    return dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+def yolo_dirs(root, splits=("train","val","test")):
+    """Create <root>/images/<split> and <root>/labels/<split>; returns root."""
+    root = Path(root)
+    for s in splits:
+        (root/f"images/{s}").mkdir(parents=True, exist_ok=True)
+        (root/f"labels/{s}").mkdir(parents=True, exist_ok=True)
+    return root
+
+def atomic_write_bytes(dst, data: bytes):
+    dst = Path(dst); tmp = _tmp_name(dst)
+    try:
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def atomic_copy(src, dst):
+    dst = Path(dst); tmp = _tmp_name(dst)
+    try:
+        shutil.copyfile(src, tmp)   # sendfile() where the OS has it
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+class OutputWriter:
+    def __init__(self, workers=8, max_pending=64, prof=None):
+        self._prof = prof if prof is not None and prof.enabled else None
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tools-writer")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._errors = []
+        self._pending = {}   # destination -> its queued/running job
+        self.written = 0
+
+    def _done(self, key, fut):
+        self._slots.release()
+        exc = fut.exception()
+        with self._lock:
+            if self._pending.get(key) is fut: del self._pending[key]
+            if exc is not None: self._errors.append(exc)
+            else: self.written += 1
+
+    def _raise_pending(self):
+        if self._errors:
+            raise self._errors[0]
+
+    def _timed(self, stage, fn, *args):
+        t = time.perf_counter()
+        try:
+            fn(*args)
+        finally:
+            dt = time.perf_counter() - t
+            with self._lock: self._prof.add(stage, dt)
+
+    def _submit(self, stage, dst, fn, *args):
+        self._raise_pending()
+        key = os.path.abspath(dst)
+        with self._lock: prev = self._pending.get(key)
+        if prev is not None: wait([prev])   # same destination still queued: it lands first
+        self._slots.acquire()   # backpressure: block while max_pending jobs are queued
+        try:
+            if self._prof is None: fut = self._pool.submit(fn, *args)
+            else: fut = self._pool.submit(self._timed, stage, fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock: self._pending[key] = fut
+        fut.add_done_callback(lambda f: self._done(key, f))
+
+    def write_bytes(self, path, data: bytes):
+        self._submit("write_labels", path, atomic_write_bytes, path, data)
+
+    def write_text(self, path, text: str, encoding="utf-8"):
+        self._submit("write_labels", path, atomic_write_bytes, path, text.encode(encoding))
+
+    def copy(self, src, dst):
+        self._submit("copy_image", dst, atomic_copy, src, dst)
+
+    def close(self):
+        """Wait for every queued write; raise the first failure, if any."""
+        self._pool.shutdown(wait=True)
+        self._raise_pending()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._pool.shutdown(wait=True)
+        if exc_type is None:
+            self._raise_pending()
+        return False
@@ -0,0 +1,184 @@
+# tools/yolo_dataset.py
+"""
+Lazy reader for YOLO-format datasets described by a data yaml
+(dataset.yaml -> data_yolo/, Rico-1/data.yaml -> the Roboflow export).
+
+    ds = YoloDataset("Rico-1/data.yaml")
+    len(ds["train"])                      # O(1) once indexed
+    img, lbl = ds["train"][0]             # paths only, nothing read yet
+    ds["train"].labels(0)                 # float32 array (n, 5): cls cx cy w h
+    for i, img, lab in ds["val"].filter(classes=[1], min_boxes=3):
+        ...
+
+Each split is indexed on first use with one os.scandir() of its images directory. The
+index is kept in data_cache/ and reused while the directory's mtime is unchanged (adding
+or removing a file bumps it), so later runs get split lengths from a single stat().
+Label files are only read when asked for, one at a time, and numpy is only imported then,
+so indexing and split lengths stay cheap to start. yaml is imported by YoloDataset itself:
+the converters only need split_counts() from here.
+"""
+from __future__ import annotations
+import hashlib, json, os
+from pathlib import Path
+
+PROJECT   = Path(__file__).resolve().parents[1]
+CACHE_DIR = PROJECT/"data_cache"
+IMG_EXTS  = {".bmp",".jpeg",".jpg",".png",".tif",".tiff",".webp"}
+SPLITS    = ("train","val","test")
+
+def label_path(img: Path) -> Path:
+    # ultralytics convention: last /images/ component -> /labels/, extension -> .txt
+    parts = list(img.parts)
+    i = len(parts) - 1 - parts[::-1].index("images")
+    parts[i] = "labels"
+    return Path(*parts).with_suffix(".txt")
+
+def read_labels(path: Path) -> np.ndarray:
+    import numpy as np
+    try:
+        txt = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        txt = ""
+    vals = txt.split()
+    if not vals: return np.zeros((0, 5), dtype=np.float32)
+    return np.array(vals, dtype=np.float32).reshape(-1, 5)
+
+class Split:
+    """Images of one split; indexing gives (image path, label path)."""
+    def __init__(self, name: str, img_dir: Path, index: "_Index"):
+        self.name = name; self.img_dir = img_dir
+        self._index = index; self._files = None
+
+    @property
+    def files(self):
+        if self._files is None:
+            self._files = self._index.files(self.img_dir)
+        return self._files
+
+    def __len__(self):
+        return len(self.files)
+
+    def __getitem__(self, i):
+        img = self.img_dir/self.files[i]
+        return img, label_path(img)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def labels(self, i) -> np.ndarray:
+        return read_labels(self[i][1])
+
+    def filter(self, classes=None, min_boxes=None, max_boxes=None, min_area=None, max_area=None):
+        """
+        Yields (i, image path, labels) for images whose labels match. `classes` keeps images
+        with at least one box of those classes; min/max_area keep images with at least one box
+        whose w*h (normalized) is in range, and boxes outside it are dropped from the labels and
+        don't count towards min/max_boxes.
+        """
+        import numpy as np
+        cls_set = None if classes is None else np.asarray(sorted(classes), dtype=np.float32)
+        for i in range(len(self)):
+            lab = self.labels(i)
+            if min_area is not None or max_area is not None:
+                area = lab[:,3] * lab[:,4]
+                keep = np.ones(len(lab), dtype=bool)
+                if min_area is not None: keep &= area >= min_area
+                if max_area is not None: keep &= area <= max_area
+                lab = lab[keep]
+                if not len(lab): continue
+            if cls_set is not None and not np.isin(lab[:,0], cls_set).any(): continue
+            if min_boxes is not None and len(lab) < min_boxes: continue
+            if max_boxes is not None and len(lab) > max_boxes: continue
+            yield i, self.img_dir/self.files[i], lab
+
+    def class_counts(self, nc: int) -> np.ndarray:
+        import numpy as np
+        counts = np.zeros(nc, dtype=np.int64)
+        for i in range(len(self)):
+            lab = self.labels(i)
+            if len(lab): counts += np.bincount(lab[:,0].astype(np.int64), minlength=nc)[:nc]
+        return counts
+
+def _scan(img_dir):
+    with os.scandir(img_dir) as it:
+        return [e.name for e in it if e.is_file() and os.path.splitext(e.name)[1].lower() in IMG_EXTS]
+
+class _Index:
+    """Sorted image names per directory, persisted (path=None: in memory) and validated by directory mtime."""
+    def __init__(self, path):
+        self.path = path; self.data = {}
+        if path is not None:
+            try:
+                self.data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                pass
+
+    def files(self, img_dir: Path):
+        key = str(img_dir)
+        try:
+            mtime = os.stat(img_dir).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        ent = self.data.get(key)
+        if ent and ent["mtime_ns"] == mtime:
+            return ent["files"]
+        files = sorted(_scan(img_dir))
+        self.data[key] = {"mtime_ns": mtime, "files": files}
+        self._save()
+        return files
+
+    def _save(self):
+        if self.path is None: return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            tmp.write_text(json.dumps(self.data), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # read-only checkout: just don't persist
+
+class YoloDataset:
+    def __init__(self, data_yaml, cache_dir=CACHE_DIR):
+        # cache_dir=None keeps the split index in memory only
+        import yaml
+        self.yaml = Path(data_yaml).resolve()
+        cfg = yaml.safe_load(self.yaml.read_text(encoding="utf-8"))
+        names = cfg.get("names", [])
+        self.names = [names[k] for k in sorted(names)] if isinstance(names, dict) else list(names)
+        self.nc = int(cfg.get("nc", len(self.names)))
+        root = self.yaml.parent
+        if cfg.get("path"):
+            root = (self.yaml.parent/cfg["path"]).resolve() if not Path(cfg["path"]).is_absolute() else Path(cfg["path"])
+        self.root = root
+        key = hashlib.sha1(str(self.yaml).encode()).hexdigest()[:12]
+        index = _Index(Path(cache_dir)/f"yolo_index_{key}.json" if cache_dir else None)
+        self.splits = {}
+        for s in SPLITS:
+            if cfg.get(s): self.splits[s] = Split(s, self._resolve(cfg[s]), index)
+
+    def _resolve(self, p: str) -> Path:
+        x = Path(p)
+        if x.is_absolute(): return x
+        d = (self.root/x).resolve()
+        # Roboflow exports say ../train/images; ultralytics retries without the ../
+        if not d.exists() and p.startswith("../"):
+            d = (self.root/p[3:]).resolve()
+        return d
+
+    def __getitem__(self, split) -> Split:
+        return self.splits[split]
+
+    def __contains__(self, split):
+        return split in self.splits
+
+    def lengths(self) -> dict:
+        return {s: len(sp) for s, sp in self.splits.items()}
+
+def split_counts(root, splits=SPLITS) -> dict:
+    """Image count per split of a converter output dir (<root>/images/<split>), one scandir each."""
+    counts = {}
+    for s in splits:
+        try: counts[s] = len(_scan(Path(root)/f"images/{s}"))
+        except FileNotFoundError: counts[s] = 0
+    return counts